@@ -52,23 +52,201 @@ parser.add_argument("--read_ckt",
 
 parser.add_argument("--read_nldm", 
                     type=str,
-                    help="Input path to .lib file to be read using this program")
+                    nargs='+',
+                    help="Input path to .lib file to be read using this program. With several files (one per "
+                         "corner, named after the file) all corners are timed in one run (level engine)")
+
+parser.add_argument("--engine",
+                    type=str,
+                    choices=["node", "csr", "level"],
+                    default="node",
+                    help="STA engine : `node` works on Node objects, `csr` on the compiled integer graph, "
+                         "`level` on the compiled graph one topological level at a time")
+
+parser.add_argument("--lut_edge",
+                    type=str,
+                    choices=list(LUT_EDGE_MODES),
+                    default="legacy",
+                    help="Table edge handling of the `level` engine (see LUT.interpolate_batch)")
+
+parser.add_argument("--po_load",
+                    type=float,
+                    default=None,
+                    help="Load on primary outputs, in the capacitance unit of the .lib file (default : 4 INV_X1 inputs)")
+
+parser.add_argument("--arity_aware",
+                    action="store_true",
+                    help="Time every gate with the library cell of its real fan-in count, decomposing gates wider "
+                         "than any library cell into trees of smaller cells (csr/level engines)")
+
+parser.add_argument("--paths",
+                    type=int,
+                    default=0,
+                    help="Also report the K most critical paths (csr/level engines)")
+
+parser.add_argument("--paths_per_endpoint",
+                    type=int,
+                    default=0,
+                    help="Also report the K most critical paths of every primary output (csr/level engines)")
+
+parser.add_argument("--compile",
+                    action="store_true",
+                    help="Only compile the .bench file into a binary netlist (in .sta_cache) that later runs load instead of parsing it")
+
+parser.add_argument("--endpoint_paths",
+                    action="store_true",
+                    help="Also report the worst path to every primary output, traced from the arrival pass")
+
+parser.add_argument("--jobs",
+                    type=int,
+                    default=1,
+                    help="Worker threads used to time the gates of one level in parallel (level engine)")
+
+parser.add_argument("--rise_fall",
+                    action="store_true",
+                    help="Time rising and falling transitions separately, following the timing sense of every cell "
+                         "(level engine)")
+
+parser.add_argument("--min_max",
+                    action="store_true",
+                    help="Also propagate earliest (min, hold) arrivals in the same sweep and report early slacks and "
+                         "paths (level engine)")
+
+parser.add_argument("--sdc",
+                    type=str,
+                    default=None,
+                    help="Constraints file (SDC subset : create_clock, set_input_delay, set_input_transition, "
+                         "set_load, set_output_delay) for per-port arrivals, slews, loads and the clock period")
+
+parser.add_argument("--endpoints",
+                    type=str,
+                    nargs='+',
+                    default=None,
+                    help="Only time the fan-in cone of the primary outputs matching these patterns (`*`, `?` "
+                         "wildcards); the report covers that cone only (csr/level engines)")
+
+parser.add_argument("--lut_cache",
+                    type=int,
+                    default=0,
+                    help="Memoize up to N table lookups (LRU, keyed by cell, slew and load) and print the hit/miss "
+                         "counts (node/csr engines)")
+
+parser.add_argument("--lut_cache_quantum",
+                    type=float,
+                    nargs=2,
+                    default=None,
+                    metavar=("SLEW", "LOAD"),
+                    help="Round slews and loads to multiples of these steps before the cached lookups (0 : exact)")
 
 args = parser.parse_args() # Parses arguments into object.
 
+if args.lut_edge != "legacy" and args.engine != "level":
+    parser.error("--lut_edge is only supported with --engine level")
+if args.arity_aware and args.engine == "node":
+    parser.error("--arity_aware needs --engine csr or --engine level")
+if (args.paths or args.paths_per_endpoint) and args.engine == "node":
+    parser.error("--paths and --paths_per_endpoint need --engine csr or --engine level")
+if args.sdc:
+    if args.po_load is not None:
+        parser.error("--po_load cannot be combined with --sdc (use set_load in the constraints file)")
+if args.endpoints and args.engine == "node":
+    parser.error("--endpoints needs --engine csr or --engine level")
+if args.lut_cache < 0:
+    parser.error("--lut_cache must be at least 0")
+if args.lut_cache and args.engine == "level":
+    parser.error("--lut_cache needs --engine node or --engine csr")
+if args.lut_cache_quantum and not args.lut_cache:
+    parser.error("--lut_cache_quantum needs --lut_cache")
+if args.jobs < 1:
+    parser.error("--jobs must be at least 1")
+if args.jobs > 1 and args.engine != "level":
+    parser.error("--jobs needs --engine level")
+if args.rise_fall:
+    if args.engine != "level":
+        parser.error("--rise_fall needs --engine level")
+    if args.jobs > 1 or args.paths or args.paths_per_endpoint or args.endpoint_paths:
+        parser.error("--rise_fall does not support --jobs, --paths, --paths_per_endpoint or --endpoint_paths")
+    if args.read_nldm and len(args.read_nldm) > 1:
+        parser.error("--rise_fall does not support several --read_nldm libraries (corners)")
+if args.min_max:
+    if args.engine != "level":
+        parser.error("--min_max needs --engine level")
+    if args.jobs > 1 or args.rise_fall or (args.read_nldm and len(args.read_nldm) > 1):
+        parser.error("--min_max does not support --jobs, --rise_fall or several --read_nldm libraries (corners)")
+if args.read_nldm and len(args.read_nldm) > 1:
+    if args.engine != "level":
+        parser.error("Several --read_nldm libraries (corners) need --engine level")
+    if args.jobs > 1:
+        parser.error("--jobs is not supported with several --read_nldm libraries (corners)")
+
 
-if args.read_ckt and args.read_nldm :
+if args.compile :
+    if not args.read_ckt:
+        parser.error("--compile needs --read_ckt")
+    print(f"Compiled netlist written to {compile_bench(os.path.abspath(args.read_ckt))}")
+
+elif args.read_ckt and args.read_nldm :
     
     BENCH_FILE_PATH = os.path.abspath(args.read_ckt)
-    NLDM_FILE_PATH = os.path.abspath(args.read_nldm)
+    NLDM_FILE_PATHS = [os.path.abspath(path) for path in args.read_nldm]
     OUTPUT_FILE = f"ckt_traversal_{os.path.splitext(os.path.basename(BENCH_FILE_PATH))[0]}.txt"
 
-    get_bench_nodes(BENCH_FILE_PATH)
-    get_nldm_data(NLDM_FILE_PATH)
+    if args.engine == "node":
+        get_bench_nodes(BENCH_FILE_PATH)
+    else:
+        timing_graph = get_timing_graph(BENCH_FILE_PATH)
+    get_nldm_data(NLDM_FILE_PATHS[0])
+    if args.lut_cache:
+        lut_cache = enable_interpolation_cache(args.lut_cache, *(args.lut_cache_quantum or (None, None)))
     
-    set_load_capacitance(nodes)
-    Compute_arrival_timing(nodes) 
-    _circuit_delay = Compute_Required_Time(nodes)
+    if args.engine == "node":
+        if args.sdc:
+            read_sdc(os.path.abspath(args.sdc))
+        set_load_capacitance(nodes, po_load=args.po_load)
+        Compute_arrival_timing(nodes, record_worst_pin=args.endpoint_paths) 
+        _circuit_delay = Compute_Required_Time(nodes)
+        report_nodes, report_outputs = nodes, outputs_list
+    else:
+        bind_cells(timing_graph, arity_aware=args.arity_aware)
+        if args.sdc:
+            read_sdc(os.path.abspath(args.sdc), timing_graph)
+        if args.endpoints:
+            try:
+                endpoints = select_outputs(timing_graph, args.endpoints)
+            except ValueError as e:
+                parser.error(str(e))
+            full_num_nodes = timing_graph.num_nodes
+            timing_graph   = cone_graph(timing_graph, endpoints)
+            print(f"Timing the cone of {len(timing_graph.outputs)} outputs : {timing_graph.num_nodes} of {full_num_nodes} nodes.")
+        if len(NLDM_FILE_PATHS) > 1:
+            # One sweep over all corners; the report is for the corner with the worst slack.
+            corner_timing_graph = timing_graph
+            bind_corners(corner_timing_graph, get_corner_libraries(NLDM_FILE_PATHS))
+            # With --sdc, po_load holds the set_load values only (NaN elsewhere) : other outputs get each corner's default.
+            set_load_capacitance_corners(corner_timing_graph, po_load=timing_graph.po_load if args.sdc else args.po_load)
+            Compute_arrival_timing_corners(corner_timing_graph, edge=args.lut_edge)
+            Compute_Required_Time_corners(corner_timing_graph)
+            timing_graph   = corner_graph(corner_timing_graph, worst_corner(corner_timing_graph))
+            _circuit_delay = timing_graph.circuit_delay
+        elif args.rise_fall:
+            set_load_capacitance_csr(timing_graph, po_load=args.po_load)
+            Compute_arrival_timing_rise_fall(timing_graph, edge=args.lut_edge)
+            _circuit_delay = Compute_Required_Time_rise_fall(timing_graph)
+            timing_graph   = rise_fall_graph(timing_graph)
+        elif args.min_max:
+            set_load_capacitance_csr(timing_graph, po_load=args.po_load)
+            Compute_arrival_timing_min_max(timing_graph, edge=args.lut_edge)
+            _circuit_delay = Compute_Required_Time_min_max(timing_graph)
+        elif args.engine == "level":
+            set_load_capacitance_csr(timing_graph, po_load=args.po_load)
+            Compute_arrival_timing_levelized(timing_graph, edge=args.lut_edge, jobs=args.jobs)
+            _circuit_delay = Compute_Required_Time_levelized(timing_graph)
+        else:
+            set_load_capacitance_csr(timing_graph, po_load=args.po_load)
+            Compute_arrival_timing_csr(timing_graph)
+            _circuit_delay = Compute_Required_Time_csr(timing_graph)
+        report_nodes = timing_graph.nodes_view()
+        report_outputs = [report_nodes[timing_graph.names[node_id]] for node_id in timing_graph.outputs.tolist()]
     # _critical_path = Find_critical_path(outputs_list)
     
     with open(OUTPUT_FILE, 'w') as f:
@@ -76,6 +254,9 @@ if args.read_ckt and args.read_nldm :
         f.write('\n')
         f.write(f"Circuit Delay  :  {_circuit_delay * 1000} ps")
 
+        if len(NLDM_FILE_PATHS) > 1:
+            write_corner_summary(corner_timing_graph, f)
+
         f.write("\n")
         f.write("\n")
         f.write('-' * 70)
@@ -84,7 +265,53 @@ if args.read_ckt and args.read_nldm :
         f.write("\n")
         f.write('-' * 70)
         f.write("\n")
-        for node in nodes.values():
+        for node in report_nodes.values():
             f.write(f"{node.gate_type}-{node.name} : {node.slack * 1000} ps\n")
 
-        Find_critical_path(outputs_list, file=f)
+        Find_critical_path(report_outputs, file=f)
+
+        if args.endpoint_paths:
+            Find_endpoint_paths(report_outputs, file=f)
+
+        if args.paths:
+            write_paths(timing_graph, worst_paths(timing_graph, args.paths), f,
+                        f"TOP {args.paths} CRITICAL PATHS")
+
+        if args.paths_per_endpoint:
+            for endpoint, paths in worst_paths_per_endpoint(timing_graph, args.paths_per_endpoint).items():
+                write_paths(timing_graph, paths, f,
+                            f"TOP {args.paths_per_endpoint} CRITICAL PATHS TO {timing_graph.names[endpoint]}")
+
+        if args.min_max:
+            early_view    = early_graph(timing_graph)
+            early_nodes   = early_view.nodes_view()
+            early_outputs = [early_nodes[timing_graph.names[node_id]] for node_id in timing_graph.outputs.tolist()]
+
+            f.write("\n")
+            f.write('-' * 70)
+            f.write("\n")
+            f.write("\t \t EARLY (HOLD) SLACKS")
+            f.write("\n")
+            f.write('-' * 70)
+            f.write("\n")
+            for node in early_nodes.values():
+                f.write(f"{node.gate_type}-{node.name} : {node.slack * 1000} ps\n")
+
+            Find_critical_path(early_outputs, file=f, title="EARLY CRITICAL PATH")
+
+            if args.endpoint_paths:
+                Find_endpoint_paths(early_outputs, f, title="SHORTEST PATH TO")
+
+            if args.paths:
+                write_paths(timing_graph, worst_paths(timing_graph, args.paths, early=True), f,
+                            f"TOP {args.paths} EARLY (HOLD) PATHS")
+
+            if args.paths_per_endpoint:
+                for endpoint, paths in worst_paths_per_endpoint(timing_graph, args.paths_per_endpoint, early=True).items():
+                    write_paths(timing_graph, paths, f,
+                                f"TOP {args.paths_per_endpoint} EARLY (HOLD) PATHS TO {timing_graph.names[endpoint]}")
+
+    if args.lut_cache:
+        cache_stats = lut_cache.stats()
+        print(f"Interpolation cache : {cache_stats['hits']} hits, {cache_stats['misses']} misses "
+              f"({cache_stats['hit_rate'] * 100:.1f} % hit rate)")
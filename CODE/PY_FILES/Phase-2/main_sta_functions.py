@@ -16,7 +16,18 @@ Please note that due to some constraints, this code will not fully work on the f
 
 import numpy as np
 import re
-from collections import deque
+import os
+import hashlib
+import json
+import heapq
+import math
+import copy
+from collections import deque, OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+try:
+    from multiprocessing import shared_memory  # Python 3.8+, only needed by SECTION 11
+except ImportError:
+    shared_memory = None
 import debugpy
 
 
@@ -36,6 +47,23 @@ class LUT :
         self.ost_load_capacitance = None  # index-2 for output slew
         self.delay_table          = None  # 2D numpy array for delay
         self.output_slew_table    = None  # 2D numpy array for output slew
+        self.shared_index         = True  # True when delay and output slew tables use the same index
+        self.cell_rise            = None  # Delay to a rising output  (None : delay_table is used)
+        self.cell_fall            = None  # Delay to a falling output (None : delay_table is used)
+        self.rise_transition      = None  # Rising output slew  (None : output_slew_table is used)
+        self.fall_transition      = None  # Falling output slew (None : output_slew_table is used)
+        self.timing_sense         = "non_unate"  # positive_unate, negative_unate or non_unate, see TIMING_SENSES
+
+    def _index_for(self, table):
+        """(slew index, capacitance index) used to look up `table`.
+
+        The delay table uses its own index_1/index_2 when the NLDM file gives 
+        them, every other table uses the output slew index.
+        """
+        is_delay = table is self.delay_table or (table is not None and (table is self.cell_rise or table is self.cell_fall))
+        if is_delay and self.input_slews is not None and self.load_capacitance is not None:
+            return self.input_slews, self.load_capacitance
+        return self.ost_input_slews, self.ost_load_capacitance
 
     def interpolate_table(self, table, slew: float, capacitance: float):
         """Performs bilinear interpolation on the given table to 
@@ -56,16 +84,18 @@ class LUT :
         if self.ost_load_capacitance is None or self.ost_input_slews is None:
             raise ValueError("ost_load_capacitance or self.ost_input_slews is None")
 
+        input_slews, load_capacitance = self._index_for(table)
+
         # Finding the indices for the given slew and capacitance
-        row_1 = np.searchsorted(self.ost_load_capacitance, capacitance) - 1
-        row_2 = min(row_1 + 1, len(self.ost_load_capacitance) - 1)
+        row_1 = np.searchsorted(load_capacitance, capacitance) - 1
+        row_2 = min(row_1 + 1, len(load_capacitance) - 1)
         
-        col_1 = np.searchsorted(self.ost_input_slews, slew) - 1
-        col_2 = min(col_1 + 1, len(self.ost_input_slews) - 1)
+        col_1 = np.searchsorted(input_slews, slew) - 1
+        col_2 = min(col_1 + 1, len(input_slews) - 1)
 
         # Getting the bounding values
-        C_1, C_2 = self.ost_load_capacitance[row_1], self.ost_load_capacitance[row_2]
-        tau_1, tau_2 = self.ost_input_slews[col_1], self.ost_input_slews[col_2]
+        C_1, C_2 = load_capacitance[row_1], load_capacitance[row_2]
+        tau_1, tau_2 = input_slews[col_1], input_slews[col_2]
         # v11, v12 = table[row_1, col_1], table[row_1, col_2]
         # v21, v22 = table[row_2, col_1], table[row_2, col_2]
         v11, v12 = table[row_1, col_1], table[col_2, row_1]
@@ -101,6 +131,202 @@ class LUT :
             print(f"Interpolation result is nan for slew={slew}, capacitance={capacitance}")
         
         return v
+
+    @staticmethod
+    def _bracket(index, values, edge):
+        """Finds the two index points around every value.
+
+        Returns (i_1, i_2, values) where index[i_1], index[i_2] bracket each value.
+        See interpolate_batch() for the `edge` modes. With "clamp" the returned 
+        values are clamped into the index range.
+        """
+        if edge == "legacy":
+            i_1 = np.searchsorted(index, values) - 1
+            i_2 = np.minimum(i_1 + 1, len(index) - 1)
+            return i_1, i_2, values
+
+        if edge == "clamp":
+            values = np.clip(values, index[0], index[-1])
+        elif edge != "extrapolate":
+            raise ValueError(f"Unknown LUT edge mode '{edge}', expected one of {LUT_EDGE_MODES}")
+
+        i_1 = np.clip(np.searchsorted(index, values) - 1, 0, len(index) - 2)
+        return i_1, i_1 + 1, values
+
+    def interpolate_delay_slew(self, slew: float, capacitance: float):
+        """Fused interpolate_table() on `delay_table` and `output_slew_table`,
+        through `interpolation_cache` when one is enabled (see 
+        enable_interpolation_cache()).
+
+        @return (cell delay, output slew)
+        """
+        if interpolation_cache is not None:
+            return interpolation_cache.lookup(self, slew, capacitance)
+        return self._interpolate_delay_slew(slew, capacitance)
+
+    def _interpolate_delay_slew(self, slew: float, capacitance: float):
+        """Fused interpolate_table() on `delay_table` and `output_slew_table`.
+
+        Both tables are indexed by the same slew and capacitance points, so the
+        index search, bounding values and bilinear terms are computed once and 
+        applied to both tables. Each result is bit-identical to the matching 
+        interpolate_table() call.
+
+        If the two tables have different indexes this falls back to two 
+        interpolate_table() calls.
+
+        @return (cell delay, output slew)
+        """
+        if not self.shared_index:
+            return (self.interpolate_table(self.delay_table, slew, capacitance),
+                    self.interpolate_table(self.output_slew_table, slew, capacitance))
+
+        if self.ost_load_capacitance is None or self.ost_input_slews is None:
+            raise ValueError("ost_load_capacitance or self.ost_input_slews is None")
+
+        row_1 = np.searchsorted(self.ost_load_capacitance, capacitance) - 1
+        row_2 = min(row_1 + 1, len(self.ost_load_capacitance) - 1)
+        
+        col_1 = np.searchsorted(self.ost_input_slews, slew) - 1
+        col_2 = min(col_1 + 1, len(self.ost_input_slews) - 1)
+
+        C_1, C_2 = self.ost_load_capacitance[row_1], self.ost_load_capacitance[row_2]
+        tau_1, tau_2 = self.ost_input_slews[col_1], self.ost_input_slews[col_2]
+        dC_2, dC_1     = C_2 - capacitance, capacitance - C_1
+        dtau_2, dtau_1 = tau_2 - slew, slew - tau_1
+
+        if tau_1 == tau_2:
+            denominator = (C_2 - C_1) * (tau_2)
+        elif C_1 == C_2:
+            denominator = (C_2) * (tau_2 - tau_1)
+        else:
+            denominator = (C_2 - C_1) * (tau_2 - tau_1)
+
+        values = []
+        for table in (self.delay_table, self.output_slew_table):
+            v11, v12 = table[row_1, col_1], table[col_2, row_1]
+            v21, v22 = table[col_1, row_2], table[row_2, col_2]
+            values.append((v11 * dC_2 * dtau_2 +
+                           v12 * dC_1 * dtau_2 +
+                           v21 * dC_2 * dtau_1 +
+                           v22 * dC_1 * dtau_1) / denominator)
+
+        return values[0], values[1]
+
+    def _locate_batch(self, slews, capacitances, edge, table=None):
+        """Index search and bilinear terms for interpolate_batch().
+
+        The result only depends on the table index (that of `table`), so it 
+        can be applied to every table of this cell sharing that index with 
+        _batch_values().
+        """
+        if self.ost_load_capacitance is None or self.ost_input_slews is None:
+            raise ValueError("ost_load_capacitance or self.ost_input_slews is None")
+
+        input_slews, load_capacitance = self._index_for(table)
+
+        slew        = np.asarray(slews, dtype=np.float64)
+        capacitance = np.asarray(capacitances, dtype=np.float64)
+
+        row_1, row_2, capacitance = self._bracket(load_capacitance, capacitance, edge)
+        col_1, col_2, slew        = self._bracket(input_slews, slew, edge)
+
+        C_1, C_2 = load_capacitance[row_1], load_capacitance[row_2]
+        tau_1, tau_2 = input_slews[col_1], input_slews[col_2]
+
+        # (table row, table column) of the four corners. Table rows follow index_1 (slew), columns index_2
+        # (capacitance). "legacy" keeps the corner picks of interpolate_table(), which only match these on
+        # symmetric tables; 2D indexing wraps negative indices and raises IndexError out of range, as the
+        # scalar call does.
+        if edge == "legacy":
+            corners = ((row_1, col_1), (col_2, row_1), (col_1, row_2), (row_2, col_2))
+        else:
+            corners = ((col_1, row_1), (col_1, row_2), (col_2, row_1), (col_2, row_2))
+
+        denominator = np.where(tau_1 == tau_2, (C_2 - C_1) * (tau_2),
+                      np.where(C_1 == C_2, (C_2) * (tau_2 - tau_1),
+                               (C_2 - C_1) * (tau_2 - tau_1)))
+
+        return corners, (C_2 - capacitance, capacitance - C_1, tau_2 - slew, slew - tau_1), denominator
+
+    @staticmethod
+    def _batch_values(table, location):
+        """Applies a _locate_batch() result to `table`."""
+        (p11, p12, p21, p22), (dC_2, dC_1, dtau_2, dtau_1), denominator = location
+        v11, v12 = table[p11], table[p12]
+        v21, v22 = table[p21], table[p22]
+
+        numerator = (v11 * dC_2 * dtau_2 +
+                     v12 * dC_1 * dtau_2 +
+                     v21 * dC_2 * dtau_1 +
+                     v22 * dC_1 * dtau_1)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return numerator / denominator
+
+    def interpolate_batch(self, table, slews, capacitances, edge="legacy"):
+        """Array version of interpolate_table().
+
+        Looks up every (slews[i], capacitances[i]) pair at once : the index 
+        search, corner gathering and bilinear weights are all done on whole 
+        arrays. Scalars are accepted too, and the result has the shape of 
+        the broadcast inputs.
+
+        `edge` decides what happens when a slew or capacitance is outside 
+        the table's index range :
+            - "legacy"      : same index search as interpolate_table(), so every
+                              element is bit-identical to the scalar call. A value
+                              below the first index point wraps around to the last
+                              one, and above the last point both corners collapse
+                              onto it (which gives NaN when it happens on both axes).
+            - "clamp"       : the value is clamped to the first/last index point,
+                              so results never leave the range of the table.
+            - "extrapolate" : the first/last segment of the table is extended 
+                              linearly past the edge.
+        "clamp" and "extrapolate" read the four table entries around the point
+        (rows : index_1 slews, columns : index_2 capacitances). "legacy" reads
+        the same (transposed) entries as interpolate_table(), so inside the 
+        index range all three modes only agree on symmetric tables.
+        """
+        return self._batch_values(table, self._locate_batch(slews, capacitances, edge, table))
+
+    def transition_tables(self, transition):
+        """
+        (delay table, output slew table) for a rising (RISE) or falling (FALL)
+        output. Falls back to `delay_table` / `output_slew_table` when the 
+        library has no separate table for that transition.
+        """
+        if transition == RISE:
+            delay_table, slew_table = self.cell_rise, self.rise_transition
+        elif transition == FALL:
+            delay_table, slew_table = self.cell_fall, self.fall_transition
+        else:
+            raise ValueError(f"Unknown transition {transition}, expected RISE ({RISE}) or FALL ({FALL})")
+        return (self.delay_table if delay_table is None else delay_table,
+                self.output_slew_table if slew_table is None else slew_table)
+
+    def interpolate_delay_slew_batch(self, slews, capacitances, edge="legacy", transition=None):
+        """Array version of interpolate_delay_slew().
+
+        The index search and bilinear terms are shared by both tables when 
+        they have the same index.
+
+        @param[in] transition RISE or FALL to use the tables of that output 
+                              transition (see transition_tables()), None for
+                              `delay_table` / `output_slew_table`.
+        @return (cell delay array, output slew array)
+        """
+        if transition is None:
+            delay_table, slew_table = self.delay_table, self.output_slew_table
+        else:
+            delay_table, slew_table = self.transition_tables(transition)
+
+        if not self.shared_index:
+            return (self.interpolate_batch(delay_table, slews, capacitances, edge),
+                    self.interpolate_batch(slew_table, slews, capacitances, edge))
+
+        location = self._locate_batch(slews, capacitances, edge)
+        return self._batch_values(delay_table, location), self._batch_values(slew_table, location)
     
 
 class Node:
@@ -111,6 +337,9 @@ class Node:
         self.Cload     = 0.0
         self.fan_ins   = []  # List of instances that fan-in to this node
         self.fan_outs  = []  # List of instances that fan-out from this node
+        self.fan_in_arcs  = []  # TimingArc of every input pin, in fan_ins order (see build_node_arcs())
+        self.fan_out_arcs = []  # TimingArcs driven by this node
+        self.lut       = None  # LUT of the cell bound to this gate, see bind_node_cells()
         
         # Every pin of a gate(node) will have the following attributes
         # arrival_time, input_slew will have the the same 
@@ -128,38 +357,439 @@ class Node:
         self.t_out_max_index    = None # Index of maximum value in t_out list.
         self.slack              = None # Slack = Ckt_Delay - a_out. Ckt_Delay is max_delay * 1.1
         self.required_time      = None # Required Time used to calculate slack
+        self.worst_fan_in       = None # Fan-in whose pin set a_out (recorded by Compute_arrival_timing(record_worst_pin=True))
+
+        # Port constraints, see apply_node_constraints()
+        self.pi_arrival = PI_ARRIVAL_TIME  # Arrival time, if a primary input
+        self.pi_slew    = PI_SLEW          # Slew, if a primary input
+        self.po_load    = None             # Load if a primary output (None : po_load of set_load_capacitance())
+        self.po_delay   = 0.0              # Output delay, if a primary output
 
     def Cload_calculations(self):
         """ 
         Calculates Output load capacitance for each node.
         
-        Checks the fan_outs of current node and matches the 
-        gate_type of this node with corresponding cell in NLDM
-        file to extract capacitance of that cell.
+        Adds up the input capacitance of the cell bound to each 
+        of the fan_outs of current node (see bind_node_cells()).
         
         If current node has more than two fanouts, Load capacitance 
         is given by the sum of all capacitances of fanouts multiplied by 
         number of fanouts divided by 2.
         
         """
-        gate_type_to_lut_name = {
-            'NAND' : 'NAND2_X1',
-            'NOR'  : 'NOR2_X1',
-            'AND'  : 'AND2_X1',
-            'OR'   : 'OR2_X1',
-            'XOR'  : 'XOR2_X1',
-            'INV'  : 'INV_X1',
-            'NOT'  : 'INV_X1',
-            'BUF'  : 'BUF_X1',
-            'BUFF'  : 'BUF_X1',
-        }
-        
         total_capacitance = 0.0
         for fan_out_node in self.fan_outs:
-            lut_key = gate_type_to_lut_name[fan_out_node.gate_type]
-            total_capacitance += float(LUT_nodes_set[lut_key].capacitance)
+            total_capacitance += fan_out_node.lut.capacitance
     
-            self.Cload = total_capacitance
+        self.Cload = total_capacitance
+
+class TimingArc :
+    """
+    One input pin of a gate : the arc from the driving node to the gate output.
+
+    Delay and output slew through the arc are stored on it by the arrival pass,
+    so the required time pass reads them straight from the arc.
+    """
+
+    def __init__(self, driver, sink, pin):
+        self.driver = driver   # Node driving the pin
+        self.sink   = sink     # Node (gate) the pin belongs to
+        self.pin    = pin      # Index of the pin in sink.fan_ins
+        self.delay  = None     # Cell delay from this pin to the gate output
+        self.slew   = None     # Output slew caused by this pin
+
+
+class NameTable :
+    """
+    Interned net names.
+
+    All names are stored once, utf-8 encoded back to back in `blob`, with name 
+    `i` being `blob[offsets[i]:offsets[i+1]]`. The engine only ever deals with 
+    the integer IDs; a name is decoded when it is asked for (at report time).
+    The name -> ID dict is only built the first time a lookup by name is made,
+    and so is the sorted index used by match().
+    """
+
+    def __init__(self, names=()):
+        encoded      = [name.encode() for name in names]
+        self.blob    = np.frombuffer(b"".join(encoded), dtype=np.uint8)
+        self.offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum([len(name) for name in encoded], out=self.offsets[1:])
+        self._ids    = None
+        self._order  = None  # Name IDs in sorted name order, see match()
+        self._sorted = None  # Names in sorted order
+
+    @classmethod
+    def from_arrays(cls, blob, offsets):
+        table = cls()
+        table.blob, table.offsets = blob, offsets
+        return table
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, node_id):
+        return self.blob[self.offsets[node_id]:self.offsets[node_id + 1]].tobytes().decode()
+
+    def __iter__(self):
+        data    = self.blob.tobytes()
+        offsets = self.offsets.tolist()
+        return (data[offsets[i]:offsets[i + 1]].decode() for i in range(len(offsets) - 1))
+
+    @property
+    def ids(self):
+        """Name -> ID dict."""
+        if self._ids is None:
+            self._ids = {name: node_id for node_id, name in enumerate(self)}
+        return self._ids
+
+    def match(self, pattern:str):
+        """
+        IDs (ascending) of the names matching the glob `pattern` (`*` : any 
+        string, `?` : any character). The literal prefix of the pattern 
+        (`DATAI_` for `DATAI_*`) is located by binary search in the sorted 
+        names, and only names with that prefix are tested, so a pattern costs
+        O(log N + matches) once the index is built.
+        """
+        if self._sorted is None:
+            names        = np.array(list(self), dtype=str)
+            self._order  = np.argsort(names, kind="stable")
+            self._sorted = names[self._order]
+
+        prefix = re.match(r"[^*?]*", pattern).group()
+        lo     = np.searchsorted(self._sorted, prefix, "left")
+        if prefix == pattern:
+            return np.sort(self._order[lo:np.searchsorted(self._sorted, prefix, "right")])
+
+        hi       = np.searchsorted(self._sorted, prefix + "\U0010ffff", "right")
+        name_ids = self._order[lo:hi]
+        if pattern != prefix + "*":
+            regex = re.compile("".join(".*" if char == "*" else "." if char == "?" else re.escape(char)
+                                       for char in pattern) + r"\Z", re.DOTALL)
+            keep  = [regex.match(name) is not None for name in self._sorted[lo:hi].tolist()]
+            name_ids = name_ids[np.array(keep, dtype=bool)]
+        return np.sort(name_ids)
+
+    def extended(self, names):
+        """New table with `names` appended (the table itself is left as is, it may be shared)."""
+        added = NameTable(names)
+        return NameTable.from_arrays(np.concatenate((self.blob, added.blob)),
+                                     np.concatenate((self.offsets, added.offsets[1:] + self.offsets[-1])))
+
+    def nbytes(self):
+        return self.blob.nbytes + self.offsets.nbytes
+
+
+class TimingGraph :
+    """
+    Compiled, integer-indexed form of the netlist.
+
+    Every node gets an integer ID (its position in `nodes`). Fan-ins and fan-outs 
+    are stored in CSR form : the input pins of node `i` are 
+    `fanin_idx[fanin_ptr[i]:fanin_ptr[i+1]]`, and its fan-outs are 
+    `fanout_idx[fanout_ptr[i]:fanout_ptr[i+1]]`. Every input pin has a position 
+    in `fanin_idx`, and `fanout_pin` gives that position for each fan-out so 
+    the backward pass can find the delay of the pin it is looking at.
+
+    Timing values are kept in NumPy columns with one entry per node 
+    (`pin_delay` has one entry per input pin).
+    """
+
+    def __init__(self):
+        self.names      = NameTable()  # Node ID -> net name
+        self.type_names = []    # Gate type code -> gate type string
+        self.gate_type  = None  # Gate type code of every node
+        self.fanin_ptr  = None  # CSR offsets into fanin_idx  (length N+1)
+        self.fanin_idx  = None  # Driver node ID of every input pin
+        self.fanout_ptr = None  # CSR offsets into fanout_idx (length N+1)
+        self.fanout_idx = None  # Sink node ID of every fan-out
+        self.fanout_pin = None  # Input pin (position in fanin_idx) of every fan-out
+        self.arc_sink   = None  # Gate of every input pin; pin k is the timing arc fanin_idx[k] -> arc_sink[k]
+        self.outputs    = None  # Node IDs of primary outputs
+        self.is_output  = None  # True for nodes that are primary outputs
+        self.pi_arrival = None  # Arrival time of nodes without fan-ins (primary inputs)
+        self.pi_slew    = None  # Slew of nodes without fan-ins (primary inputs)
+        self.cells      = []    # Cell index -> LUT of the bound library cell, see bind_cells()
+        self.cell       = None  # Cell index of every node, -1 for nodes without a cell (INPUT)
+        self.cell_cap   = None  # Input pin capacitance of every bound cell
+        self.po_load    = None  # Load on every primary output (only read for outputs, NaN : default), see set_load_capacitance_csr()
+        self.po_delay   = None  # External delay after every primary output (set_output_delay), None : 0
+        self.clock_period   = None  # Required time reference of outputs (create_clock), None : 1.1 * latest output arrival
+        self.cone_nodes     = None  # Node ID in the full graph of every node of a cone (SECTION 16), see cone_graph()
+        self.load_driver    = None  # Cone only : loaded node of every fan-out pin in the full graph ...
+        self.load_cell      = None  # ... the cell index of that pin's gate ...
+        self.load_outputs   = None  # ... and the nodes whose Cload is the output load (outputs of the full graph)
+        self.arity_aware    = False # Cells picked per (function, fan-in count), see decompose_wide_gates()
+        self.num_net_nodes  = None  # Nodes from the netlist; IDs from here on are decomposition nodes
+
+        self.Cload      = None  # Load capacitance
+        self.arrival    = None  # Output arrival time (a_out)
+        self.slew       = None  # Output slew (t_out)
+        self.required   = None  # Required time
+        self.slack      = None  # Slack = required - arrival
+        self.pin_delay  = None  # Cell delay of every input pin (timing arc), aligned with fanin_idx
+        self.pin_slew   = None  # Output slew caused by every input pin, aligned with fanin_idx
+        self.worst_pin  = None  # Input pin (0-based, within the node) that set the arrival, -1 for primary inputs
+
+        self.circuit_delay  = None      # Set by the required time pass
+        self.lut_edge       = "legacy"  # Table edge mode used by the arrival pass
+        self.topo_order     = None      # Node IDs in topological order, see topological_order()
+        self.level          = None      # Logic level of every node (-1 if unreachable), see topological_order()
+        self.rank           = None      # Position of every node in topological order (incremental updates)
+        self.dirty_load     = set()     # Nodes whose Cload must be recomputed by update_timing()
+        self.dirty_arrival  = set()     # Nodes whose arrival must be recomputed by update_timing()
+        self.dirty_required = set()     # Nodes whose required time must be recomputed by update_timing()
+        self.shared_blocks  = []        # Shared memory blocks backing the arrays, see share_timing_graph()
+
+        # Multi-corner timing (SECTION 12) : one row per corner, [corners x nodes] (or x input pins)
+        self.corners          = []    # Corner names
+        self.corner_luts      = []    # Cell name -> LUT dict of every corner library
+        self.corner_cells     = []    # `cells` of every corner : same cell names, that corner's LUTs
+        self.corner_Cload     = None
+        self.corner_arrival   = None
+        self.corner_slew      = None
+        self.corner_pin_delay = None
+        self.corner_pin_slew  = None
+        self.corner_worst_pin = None
+        self.corner_required  = None
+        self.corner_slack     = None
+
+        # Rise / fall timing (SECTION 13) : rows [RISE, FALL] of the output transition
+        self.rf_arrival   = None
+        self.rf_slew      = None
+        self.rf_pin_delay = None  # [input transition, output transition, pin], NaN where the cell has no such arc
+        self.rf_required  = None
+        self.rf_slack     = None
+
+        # Early (min, hold) timing (SECTION 14); the late (max, setup) values are the columns above
+        self.early_arrival   = None
+        self.early_slew      = None
+        self.early_pin_delay = None
+        self.early_worst_pin = None  # Input pin that set the early arrival
+        self.early_required  = None
+        self.early_slack     = None  # early_arrival - early_required
+        self.hold_required   = None  # Early required time of primary outputs
+
+    @property
+    def num_nodes(self):
+        return len(self.names)
+
+    @property
+    def ids(self):
+        """Net name -> node ID."""
+        return self.names.ids
+
+    def fan_ins(self, node_id):
+        return self.fanin_idx[self.fanin_ptr[node_id]:self.fanin_ptr[node_id + 1]]
+
+    def fan_outs(self, node_id):
+        return self.fanout_idx[self.fanout_ptr[node_id]:self.fanout_ptr[node_id + 1]]
+
+    def nodes_view(self):
+        """
+        Returns a `nodes`-like dict of NodeView objects backed by this graph.
+        Nodes added by decompose_wide_gates() are left out.
+        """
+        num_nodes = self.num_nodes if self.num_net_nodes is None else self.num_net_nodes
+        return {self.names[node_id]: NodeView(self, node_id) for node_id in range(num_nodes)}
+
+    def nbytes(self):
+        """Bytes held by the graph arrays and the name table."""
+        return self.names.nbytes() + sum(value.nbytes for value in vars(self).values() if isinstance(value, np.ndarray))
+
+
+class NodeView :
+    """
+    Read-only Node look-alike for one row of a TimingGraph.
+
+    Lets the report code (slack listing, Find_critical_path()) run unchanged on
+    a compiled graph.
+    """
+
+    __slots__ = ('graph', 'id')
+
+    def __init__(self, graph, node_id):
+        self.graph = graph
+        self.id    = node_id
+
+    def _value(self, column):
+        if column is None:
+            return None
+        return column[self.id].item()
+
+    name          = property(lambda self: self.graph.names[self.id])
+    gate_type     = property(lambda self: self.graph.type_names[self.graph.gate_type[self.id]])
+    Cload         = property(lambda self: self._value(self.graph.Cload))
+    a_out         = property(lambda self: self._value(self.graph.arrival))
+    t_out         = property(lambda self: self._value(self.graph.slew))
+    required_time = property(lambda self: self._value(self.graph.required))
+
+    @property
+    def worst_fan_in(self):
+        graph = self.graph
+        if graph.worst_pin is None or graph.worst_pin[self.id] < 0:
+            return None
+        return NodeView(graph, graph.fanin_idx[graph.fanin_ptr[self.id] + graph.worst_pin[self.id]].item())
+    slack         = property(lambda self: self._value(self.graph.slack))
+    fan_ins       = property(lambda self: [NodeView(self.graph, i) for i in self.graph.fan_ins(self.id).tolist()])
+    fan_outs      = property(lambda self: [NodeView(self.graph, i) for i in self.graph.fan_outs(self.id).tolist()])
+
+
+class Design :
+    """
+    On-demand (lazy) arrival times of a TimingGraph.
+
+    arrival(name) and slew(name) only time the part of the node's fan-in cone
+    that is not known yet, loads included, and remember the results. A few 
+    queries on a large design only cost the cones they touch, and the values
+    are those of a full arrival pass.
+
+    Edits are made with the eco_* functions on `graph`. The next query forgets
+    the fan-out cones of the edited nodes (taken from the dirty sets of the 
+    graph, which it clears). The Design owns the timing columns of the graph :
+    do not run the full passes or update_timing() on it at the same time.
+    """
+
+    def __init__(self, graph, edge="legacy"):
+        self.graph      = graph
+        self.known      = np.zeros(graph.num_nodes, dtype=bool)  # Arrival and slew of the node are up to date
+        self.load_known = np.zeros(graph.num_nodes, dtype=bool)  # Cload of the node is up to date
+        self.evaluated  = 0   # Nodes timed so far (memo misses)
+
+        _bound_cells(graph)
+        if graph.po_load is None or len(graph.po_load) != graph.num_nodes:
+            graph.po_load = np.full(graph.num_nodes, np.nan)
+        for field, size, fill, dtype in (("Cload",     graph.num_nodes,      np.nan, np.float64),
+                                         ("arrival",   graph.num_nodes,      np.nan, np.float64),
+                                         ("slew",      graph.num_nodes,      np.nan, np.float64),
+                                         ("pin_delay", len(graph.fanin_idx), 0.0,    np.float64),
+                                         ("pin_slew",  len(graph.fanin_idx), 0.0,    np.float64),
+                                         ("worst_pin", graph.num_nodes,      -1,     np.int32)):
+            _timing_column(graph, field, size, fill, dtype)
+        graph.lut_edge = edge
+        graph.dirty_load.clear()
+        graph.dirty_arrival.clear()
+
+    def arrival(self, name:str):
+        """Arrival time (a_out) of node `name`."""
+        return self.graph.arrival[self._update(name)].item()
+
+    def slew(self, name:str):
+        """Output slew (t_out) of node `name`."""
+        return self.graph.slew[self._update(name)].item()
+
+    def invalidate(self, names=None):
+        """Forgets the arrivals of the fan-out cones of `names` (of every node if None)."""
+        if names is None:
+            self.known[:] = self.load_known[:] = False
+        else:
+            forget_fanout_cone(self.graph, [_node_id(self.graph, name) for name in names], self.known)
+
+    def _update(self, name:str):
+        graph   = self.graph
+        node_id = _node_id(graph, name)
+        if graph.dirty_load:
+            dirty_load = sorted(graph.dirty_load)
+            self.load_known[dirty_load] = False
+            forget_fanout_cone(graph, dirty_load, self.known)
+        if graph.dirty_arrival:
+            forget_fanout_cone(graph, sorted(graph.dirty_arrival), self.known)
+        graph.dirty_load.clear()
+        graph.dirty_arrival.clear()
+
+        if not self.known[node_id]:
+            self.evaluated += time_fanin_cone(graph, node_id, self.known, self.load_known)
+        return node_id
+
+
+class InterpolationCache :
+    """
+    Bounded LRU memo of LUT.interpolate_delay_slew() results.
+
+    Keyed by the cell (LUT object, so corner libraries with the same cell 
+    names do not mix) and the exact (slew, load) operands. With a quantum,
+    operands are first rounded to a multiple of it and the tables are read 
+    at the rounded point, so nearby operands share an entry (results then 
+    differ slightly from exact lookups, but do not depend on call order).
+    The least recently used entry is dropped once `maxsize` is reached. 
+    Non-finite operands (NaN slews of untimed fan-ins, ...) bypass the cache
+    and are looked up exactly, as without it.
+    """
+
+    def __init__(self, maxsize=None, slew_quantum=None, load_quantum=None):
+        maxsize = INTERPOLATION_CACHE_SIZE if maxsize is None else maxsize
+        if maxsize < 1:
+            raise ValueError(f"Interpolation cache size must be at least 1, got {maxsize}")
+        self.maxsize      = maxsize
+        self.slew_quantum = slew_quantum  # None : exact slews
+        self.load_quantum = load_quantum  # None : exact loads
+        self.entries      = OrderedDict() # (LUT, slew, load) -> (cell delay, output slew)
+        self.hits         = 0
+        self.misses       = 0
+
+    def lookup(self, lut, slew, capacitance):
+        if not (math.isfinite(slew) and math.isfinite(capacitance)):
+            return lut._interpolate_delay_slew(slew, capacitance)
+        if self.slew_quantum:
+            slew = round(slew / self.slew_quantum) * self.slew_quantum
+        if self.load_quantum:
+            capacitance = round(capacitance / self.load_quantum) * self.load_quantum
+
+        key   = (lut, slew, capacitance)
+        value = self.entries.get(key)
+        if value is not None:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+        self.misses += 1
+        value = self.entries[key] = lut._interpolate_delay_slew(slew, capacitance)
+        if len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+        return value
+
+    def clear(self):
+        """Drops all entries and resets the counters."""
+        self.entries.clear()
+        self.hits = self.misses = 0
+
+    def stats(self):
+        """Hit / miss counters, as a dict."""
+        lookups = self.hits + self.misses
+        return {
+            "hits"     : self.hits,
+            "misses"   : self.misses,
+            "hit_rate" : self.hits / lookups if lookups else 0.0,
+            "size"     : len(self.entries),
+            "maxsize"  : self.maxsize,
+        }
+
+
+class LibertyGroup :
+    """
+    One `name (args) { ... }` group of a .lib file.
+
+    Simple attributes (`name : value ;`) are stored as a string, complex 
+    attributes (`name (arg, ...) ;`) as a list of strings. Nested groups 
+    (cell, pin, timing, cell_delay, ...) are kept in order in `groups`.
+    """
+
+    def __init__(self, name="", args=None):
+        self.name       = name
+        self.args       = args if args is not None else []
+        self.attributes = {}
+        self.groups     = []
+
+    def find_groups(self, name):
+        """All groups called `name` below this group (depth first, in file order)."""
+        found = []
+        stack = list(reversed(self.groups))
+        while stack:
+            group = stack.pop()
+            if group.name == name:
+                found.append(group)
+            stack.extend(reversed(group.groups))
+        return found
 
 ####################################################################################
 #     SECTION 2 : Global Variables
@@ -169,131 +799,689 @@ nodes         = {}       # All nodes in .bench file
 inputs_list   = []       # Nodes that are of type INPUT from `nodes` list
 outputs_list  = []       # Nodes that are of type OUTPUT from `nodes` list
 circuit_delay = 0.0      # Initialize ckt delay to 0. Actual delay is calculated later in a function
+clock_period  = None     # Clock period of the node engine (create_clock), see apply_node_constraints()
 LUT_nodes_set = {}       # Each object has LUT data for a specific gate.
+topo_order    = None     # Node IDs (positions in `nodes`) in topological order, set by get_bench_nodes()
+node_level    = None     # Logic level of every node in `nodes`, set by get_bench_nodes()
+compiled_graph = None    # TimingGraph loaded from a compiled netlist by get_bench_nodes(), if any
+interpolation_cache = None  # InterpolationCache used by LUT.interpolate_delay_slew(), see enable_interpolation_cache()
+
+CACHE_DIR_NAME          = ".sta_cache"  # Created next to the input file
+LIBERTY_CACHE_VERSION   = 3             # Bump when the cached LUT layout changes
+LEVELS_CACHE_VERSION    = 1             # Bump when the cached levelization layout changes
+NETLIST_MAGIC           = b"STANETL\0"  # First 8 bytes of a compiled netlist file
+NETLIST_VERSION         = 2             # Bump when the compiled netlist layout changes
+NETLIST_ALIGN           = 64            # Byte alignment of every array in a compiled netlist
+
+LUT_EDGE_MODES  = ("legacy", "clamp", "extrapolate")  # See LUT.interpolate_batch()
+
+PI_ARRIVAL_TIME = 0      # Arrival time at primary inputs
+PI_SLEW         = 0.002  # Slew at primary inputs
+HOLD_REQUIRED_TIME = 0   # Earliest allowed arrival at primary outputs (early / hold analysis, SECTION 14)
+PO_LOAD_INV_X1  = 4      # Default primary output load, in INV_X1 input capacitances
+
+PARALLEL_MIN_GATES = 256  # Smallest chunk of a level worth handing to a worker thread
+INTERPOLATION_CACHE_SIZE = 4096  # Default number of entries of an InterpolationCache
+
+RISE, FALL     = 0, 1    # Output transition : row of the rise/fall timing columns (SECTION 13)
+TIMING_SENSES  = ("positive_unate", "negative_unate", "non_unate")
+
+# Cell function (NAND2_X1 -> NAND) -> timing sense, for libraries without `timing_sense` attributes
+FUNCTION_TIMING_SENSE = {
+    'NAND' : 'negative_unate',
+    'NOR'  : 'negative_unate',
+    'INV'  : 'negative_unate',
+    'AND'  : 'positive_unate',
+    'OR'   : 'positive_unate',
+    'BUF'  : 'positive_unate',
+    'XOR'  : 'non_unate',
+    'XNOR' : 'non_unate',
+}
+
+# Gate type in .bench file -> cell name in NLDM file
+GATE_TYPE_TO_LUT_NAME = {
+    'NAND' : 'NAND2_X1',
+    'NOR'  : 'NOR2_X1',
+    'AND'  : 'AND2_X1',
+    'OR'   : 'OR2_X1',
+    'XOR'  : 'XOR2_X1',
+    'INV'  : 'INV_X1',
+    'NOT'  : 'INV_X1',
+    'BUF'  : 'BUF_X1',
+    'BUFF' : 'BUF_X1',
+}
 
 
 ####################################################################################
 #     SECTION 3 : Parsing functions
 ####################################################################################
 
-def print_nldm_output_slew_table(NLDM_FILE:str):
+# Tokens of a .lib file : comments, quoted strings, punctuation and bare words/numbers.
+# Comments and line continuations are matched so they can be dropped.
+_LIBERTY_TOKEN = re.compile(r'/\*.*?\*/|//[^\n]*|"(?:[^"\\]|\\.)*"|[(){}:;,]|\\|[^\s(){}:;,"\\]+', re.DOTALL)
 
-    with open( NLDM_FILE ) as file :
-        
-        file_content = file.read()
-        cell_blocks = re.findall(r'cell\s*\((.*?)\)\s*{(.*?)}\s*}', file_content, re.DOTALL)
+# Tables read from a cell. cell_delay/output_slew are used when present,
+# otherwise the rise/fall tables are merged (worst of the two).
+_DELAY_TABLES = ("cell_delay", "cell_rise", "cell_fall")
+_SLEW_TABLES  = ("output_slew", "rise_transition", "fall_transition")
 
-        for cell_name, cell_content in cell_blocks:
 
-            # Extract cell capacitance
-            cell_capacitance = re.search(r'capacitance\s*:\s*(\d+\.\d+);', cell_content).group(1)
+def _liberty_string(token:str):
+    """Strips quotes and escaped line breaks from a .lib token."""
+    if token.startswith('"'):
+        token = token[1:-1].replace('\\\n', '').replace('\\\r\n', '')
+    return token
 
-            # Extract index-1 values from output_slew subsection of .lib file
-            index_1 = re.search(r'output_slew\s*\(\w+\)\s*{\s*index_1\s*\("(.*?)"\)', cell_content)
-            index_1_values = np.array(index_1.group(1).split(','), dtype=float)
-            
-            # Extract index-2 values from output_slew subsection of .lib file
-            index_2 = re.search(r'output_slew\s*\(\w+\)\s*{[^}]*?index_2\s*\("(.*?)"\)', cell_content, re.DOTALL)
-            index_2_values = np.array(index_2.group(1).split(','), dtype=float)
-            
-            # Extract output slew table from output_slew sub-section of cell in .lib file.
-            _output_slew = re.search(r'output_slew\s*\(\w+\)\s*{[^}]*?values\s*\((.*?)\);', cell_content, re.DOTALL).group(1).replace('", \\\n', '').replace('\t', '').replace('"', '')
-            rows  = _output_slew.split(' ')
-            output_slew_table = np.array([list(map(float, row.split(','))) for row in rows if row.strip() != ''])            
-        
-            # Create LUT object for each cell and assign corresponding values :
-            lut = LUT()
-            lut.cell_name = cell_name
-            lut.capacitance = cell_capacitance           # Capacitance of this cell
-            lut.ost_input_slews = index_1_values         # Index-1 values in output_slew() sub-section of a cell
-            lut.ost_load_capacitance = index_2_values    # Index-2 values in output_slew() sub-section of a cell
-            lut.output_slew_table = output_slew_table    # Output slew table as a 2D numpy array
-            LUT_nodes_set[cell_name] = lut               # Add cell to LUT set.
 
-def nldm_cell_delay_table(NLDM_FILE:str) :
+def parse_liberty(text:str):
+    """
+    Parses the contents of a .lib file into a tree of LibertyGroup objects.
+
+    The file is tokenized once and the statements are read in a single sweep
+    over the tokens with a stack of open groups :
+        - `name : value ;`            -> simple attribute
+        - `name (args) ;`             -> complex attribute (e.g. index_1, values)
+        - `name (args) { ... }`       -> nested group
+
+    @param[in] text Contents of the .lib file.
+    @return Root LibertyGroup (the `library` group is its first sub-group).
+    """
+    tokens = [token for token in _LIBERTY_TOKEN.findall(text)
+              if token != '\\' and not token.startswith('/*') and not token.startswith('//')]
+
+    root  = LibertyGroup()
+    stack = [root]
+    i, n  = 0, len(tokens)
+
+    while i < n:
+        token = tokens[i]
+        i += 1
+
+        if token == '}':
+            if len(stack) > 1:
+                stack.pop()
+            continue
+        if token in (';', ','):
+            continue
+
+        name = token
+        if i < n and tokens[i] == ':':
+            # Simple attribute
+            stack[-1].attributes[name] = _liberty_string(tokens[i + 1]) if i + 1 < n else ""
+            i += 2
+            if i < n and tokens[i] == ';':
+                i += 1
+
+        elif i < n and tokens[i] == '(':
+            # Group or complex attribute
+            i += 1
+            args = []
+            while i < n and tokens[i] != ')':
+                if tokens[i] != ',':
+                    args.append(_liberty_string(tokens[i]))
+                i += 1
+            i += 1
+
+            if i < n and tokens[i] == '{':
+                group = LibertyGroup(name, args)
+                stack[-1].groups.append(group)
+                stack.append(group)
+                i += 1
+            else:
+                stack[-1].attributes[name] = args
+                if i < n and tokens[i] == ';':
+                    i += 1
+
+    return root
+
+
+def _liberty_floats(values):
+    """Converts a complex attribute like index_1 ("0.1, 0.2") or values ("..", "..") to a NumPy array."""
+    rows = [[float(value) for value in row.split(',') if value.strip()] for row in values]
+    return np.array(rows[0] if len(rows) == 1 else rows, dtype=np.float64)
+
 
-    with open(NLDM_FILE, 'r') as file:
+def _liberty_table(group, templates):
+    """(index_1, index_2, values) of a table group, taking missing indexes from its lu_table_template."""
+    template = templates.get(group.args[0]) if group.args else None
+    index_1  = group.attributes.get("index_1") or (template.attributes.get("index_1") if template else None)
+    index_2  = group.attributes.get("index_2") or (template.attributes.get("index_2") if template else None)
+    index_1, index_2 = _liberty_floats(index_1), _liberty_floats(index_2)
+    values   = np.atleast_2d(_liberty_floats(group.attributes["values"]))
+    if values.shape != (len(index_1), len(index_2)):
+        raise ValueError(f"{group.name} table has {values.shape[0]}x{values.shape[1]} values but "
+                         f"index_1 x index_2 is {len(index_1)}x{len(index_2)}")
+    return index_1, index_2, values
 
-        file_content = file.read()
-        cell_blocks = re.findall(r'cell\s*\((.*?)\)\s*{(.*?)}\s*}', file_content, re.DOTALL)
 
+def _merge_tables(tables):
+    """
+    Merges the tables of several timing arcs into one (worst case).
+
+    Tables sharing the first table's indexes are combined with an element-wise
+    max, any other table is ignored.
+    """
+    index_1, index_2, values = tables[0]
+    for other_1, other_2, other_values in tables[1:]:
+        if np.array_equal(index_1, other_1) and np.array_equal(index_2, other_2) and other_values.shape == values.shape:
+            values = np.maximum(values, other_values)
+    return index_1, index_2, values
+
+
+def _cell_timing_sense(cell, cell_name:str):
+    """
+    `timing_sense` of the timing arcs of a cell (non_unate when they disagree).
+    If the library gives none, the usual sense of the cell function 
+    (FUNCTION_TIMING_SENSE), non_unate for unknown functions.
+    """
+    senses = {timing.attributes["timing_sense"] for timing in cell.find_groups("timing") if "timing_sense" in timing.attributes}
+    if senses:
+        return senses.pop() if len(senses) == 1 and senses <= set(TIMING_SENSES) else "non_unate"
+    match = _CELL_NAME.match(cell_name)
+    return FUNCTION_TIMING_SENSE.get(match.group(1) if match else None, "non_unate")
+
+
+def build_luts(library, templates=None):
+    """
+    Builds a LUT object for every cell of a parsed library.
+
+    @param[in] library LibertyGroup returned by parse_liberty().
+    @return Dict of cell name -> LUT.
+    """
+    if templates is None:
+        templates = {group.args[0]: group for group in library.find_groups("lu_table_template") if group.args}
+
+    luts = {}
+    for cell in library.find_groups("cell"):
+        lut = LUT()
+        lut.cell_name = cell.args[0]
+
+        # Cell capacitance, or the largest input pin capacitance.
+        if "capacitance" in cell.attributes:
+            lut.capacitance = float(cell.attributes["capacitance"])
+        else:
+            pin_caps = [float(pin.attributes["capacitance"]) for pin in cell.find_groups("pin")
+                        if "capacitance" in pin.attributes and pin.attributes.get("direction", "input") == "input"]
+            lut.capacitance = max(pin_caps) if pin_caps else 0.0
+
+        for names, kind in ((_DELAY_TABLES, "delay"), (_SLEW_TABLES, "slew")):
+            tables = cell.find_groups(names[0])
+            if not tables:
+                tables = [table for name in names[1:] for table in cell.find_groups(name)]
+            if not tables:
+                continue
+
+            index_1, index_2, values = _merge_tables([_liberty_table(table, templates) for table in tables])
+            if kind == "delay":
+                lut.input_slews, lut.load_capacitance, lut.delay_table = index_1, index_2, values
+            else:
+                lut.ost_input_slews, lut.ost_load_capacitance, lut.output_slew_table = index_1, index_2, values
 
-        for cell_name, cell_content in cell_blocks:
+        if lut.ost_input_slews is None and lut.input_slews is not None:
+            lut.ost_input_slews, lut.ost_load_capacitance = lut.input_slews, lut.load_capacitance
+        lut.shared_index = _lut_shared_index(lut)
 
-            _cell_delay = re.search(r'values\s*\((.*?)\);', cell_content, re.DOTALL).group(1).replace('", \\\n', '').replace('\t', '').replace('"', '')
-            rows = _cell_delay.split(' ')
-            cell_delay_table = np.array([list(map(float, row.split(','))) for row in rows if row.strip() != ''])
-           
+        # Separate rise / fall tables, only kept when they have the index of the merged table.
+        for field, merged, index in (("cell_rise",       "delay_table",       (lut.input_slews, lut.load_capacitance)),
+                                     ("cell_fall",       "delay_table",       (lut.input_slews, lut.load_capacitance)),
+                                     ("rise_transition", "output_slew_table", (lut.ost_input_slews, lut.ost_load_capacitance)),
+                                     ("fall_transition", "output_slew_table", (lut.ost_input_slews, lut.ost_load_capacitance))):
+            tables = cell.find_groups(field)
+            if not tables or getattr(lut, merged) is None:
+                continue
+            index_1, index_2, values = _merge_tables([_liberty_table(table, templates) for table in tables])
+            if (np.array_equal(index_1, index[0]) and np.array_equal(index_2, index[1]) and 
+                    values.shape == getattr(lut, merged).shape):
+                setattr(lut, field, values)
+        lut.timing_sense = _cell_timing_sense(cell, lut.cell_name)
 
-            lut = LUT_nodes_set[cell_name]
-            lut.delay_table = cell_delay_table       # Cell delay table as a 2D numpy array
+        luts[lut.cell_name] = lut
+
+    return luts
+
+
+def parse_bench_file(CIRCUIT_BENCH_FILE):
+    """
+    Reads a .bench file in a single pass and fills `nodes`, `inputs_list` and `outputs_list`.
+
+    Every line is read and split once. A gate may use a net that is only defined 
+    further down the file, so the first time such a net is seen a placeholder Node 
+    is created in `pending` and linked to the gate straight away. When the line 
+    defining that net is reached, the placeholder is filled in and moved into `nodes`
+    (so `nodes` keeps the order in which nets are defined in the file).
+
+    Placeholders still pending at the end of the file were never defined. They are 
+    unlinked from the gates using them, the same way the old two-pass reader skipped
+    unknown nets.
+
+    @param[in] CIRCUIT_BENCH_FILE Path to .bench file.
+    """
+    pending      = {}   # Nets used before (or without) being defined
+    output_names = []
+
+    def get_or_create(name):
+        node = nodes.get(name)
+        if node is None:
+            node = pending.get(name)
+            if node is None:
+                node = Node()
+                node.name = name
+                pending[name] = node
+        return node
+
+    def define(name):
+        node = pending.pop(name, None)
+        if node is None:
+            node = Node()
+            node.name = name
+        nodes[name] = node
+        return node
 
-def create_nodes(CIRCUIT_BENCH_FILE):
     with open(CIRCUIT_BENCH_FILE, 'r') as f:
         for line in f:
             line = line.strip()
+            if not line or line[0] == '#':
+                continue
+
             if line.startswith("INPUT"):
-                input_name = line.split('(')[1].split(')')[0]
-                node = Node()
-                node.name = input_name
+                input_name = line.partition('(')[2].partition(')')[0].strip()
+                node = define(input_name)
                 node.gate_type = "INPUT"
-
-                nodes[input_name] = node
                 inputs_list.append(node)
 
             elif line.startswith("OUTPUT"):
-                output_name = line.split('(')[1].split(')')[0]
-                node = Node()
-                node.name = output_name
-                outputs_list.append(node)
-            
+                output_names.append(line.partition('(')[2].partition(')')[0].strip())
+
             elif "=" in line:
-                out_name, expression = line.split("=")
-                out_name = out_name.strip()
-                gate_type, in_names = expression.split('(')
-                in_names = in_names.split(')')[0].split(',')
-                in_names = [name.strip() for name in in_names]
+                out_name, _, expression = line.partition("=")
+                gate_type, _, in_names = expression.partition('(')
+                in_names = in_names.partition(')')[0].split(',')
 
-                node = Node()
-                node.name = out_name
+                node = define(out_name.strip())
                 node.gate_type = gate_type.strip().upper()  # Ensure gate_type is in uppercase
-                node.fan_ins = [nodes[in_name] for in_name in in_names if in_name in nodes]
-                nodes[out_name] = node
+                for in_name in in_names:
+                    fan_in = get_or_create(in_name.strip())
+                    node.fan_ins.append(fan_in)
+                    fan_in.fan_outs.append(node)
+
+    # Nets that were used but never defined are dropped from their fan-outs.
+    for missing in pending.values():
+        for fan_out in missing.fan_outs:
+            fan_out.fan_ins = [fan_in for fan_in in fan_out.fan_ins if fan_in is not missing]
+
+    # OUTPUT nodes point to the defined node where there is one.
+    for output_name in output_names:
+        node = nodes.get(output_name)
+        if node is None:
+            node = Node()
+            node.name = output_name
+        outputs_list.append(node)
+
+def parse_bench_graph(CIRCUIT_BENCH_FILE):
+    """
+    Reads a .bench file straight into a TimingGraph, without building Node objects.
+
+    Every net name is interned into an integer symbol the first time it is seen,
+    and from then on the parser only works with symbols. Defined nets become 
+    nodes, numbered in the order they are defined (the order of `nodes` after
+    parse_bench_file()). Pins on nets that are never defined are dropped, as in
+    parse_bench_file(), so the result is identical to compile_timing_graph() on
+    the Node objects.
+
+    @param[in] CIRCUIT_BENCH_FILE Path to .bench file.
+    @return (TimingGraph, NameTable of all OUTPUT names).
+    """
+    symbols      = {}   # Net name -> symbol
+    symbol_names = []   # Symbol -> net name
+    symbol_node  = []   # Symbol -> node ID, -1 while the net is not defined
+    node_symbol  = []   # Node ID -> symbol
+    node_type    = []   # Node ID -> gate type string
+    node_fanins  = []   # Node ID -> fan-in symbols
+    output_names = []
+
+    def intern(name):
+        symbol = symbols.get(name)
+        if symbol is None:
+            symbol = symbols[name] = len(symbol_names)
+            symbol_names.append(name)
+            symbol_node.append(-1)
+        return symbol
+
+    def define(name):
+        symbol  = intern(name)
+        node_id = symbol_node[symbol]
+        if node_id < 0:
+            node_id = symbol_node[symbol] = len(node_symbol)
+            node_symbol.append(symbol)
+            node_type.append(None)
+            node_fanins.append(())
+        return node_id
 
-# Run function after the first one to set inputs and ouputs
-#   IMPORTANT : Run only after running create_nodes() function.
-def set_nodes(CIRCUIT_BENCH_FILE):
     with open(CIRCUIT_BENCH_FILE, 'r') as f:
         for line in f:
             line = line.strip()
-            if "=" in line:
-                out_name, expression = line.split("=")
-                out_name = out_name.strip()
-                gate_type, in_names = expression.split('(')
-                in_names = in_names.split(')')[0].split(',')
-                in_names = [name.strip() for name in in_names]
+            if not line or line[0] == '#':
+                continue
+
+            if line.startswith("INPUT"):
+                node_id = define(line.partition('(')[2].partition(')')[0].strip())
+                node_type[node_id]   = "INPUT"
+                node_fanins[node_id] = ()
+
+            elif line.startswith("OUTPUT"):
+                output_names.append(line.partition('(')[2].partition(')')[0].strip())
+
+            elif "=" in line:
+                out_name, _, expression = line.partition("=")
+                gate_type, _, in_names = expression.partition('(')
+                node_id = define(out_name.strip())
+                node_type[node_id]   = gate_type.strip().upper()
+                node_fanins[node_id] = [intern(in_name.strip()) for in_name in in_names.partition(')')[0].split(',')]
+
+    graph = TimingGraph()
+    graph.names      = NameTable([symbol_names[symbol] for symbol in node_symbol])
+    graph.type_names = list(dict.fromkeys(node_type))
+    type_codes       = {gate_type: code for code, gate_type in enumerate(graph.type_names)}
+    graph.gate_type  = np.array([type_codes[gate_type] for gate_type in node_type], dtype=np.int8)
+
+    # Map fan-in symbols to node IDs, dropping nets that were never defined.
+    counts    = np.array([len(fanins) for fanins in node_fanins], dtype=np.int64)
+    pins      = np.array([symbol for fanins in node_fanins for symbol in fanins], dtype=np.int64)
+    pin_node  = np.array(symbol_node, dtype=np.int32)[pins] if pins.size else np.zeros(0, dtype=np.int32)
+    defined   = pin_node >= 0
+    pin_owner = np.repeat(np.arange(len(node_symbol)), counts)[defined]
+
+    graph.fanin_idx = pin_node[defined]
+    graph.fanin_ptr = np.zeros(len(node_symbol) + 1, dtype=np.int32)
+    np.cumsum(np.bincount(pin_owner, minlength=len(node_symbol)), out=graph.fanin_ptr[1:])
+    _build_fanouts(graph)
+
+    graph.outputs = np.array([symbol_node[symbols[name]] for name in output_names
+                              if name in symbols and symbol_node[symbols[name]] >= 0], dtype=np.int32)
+    _init_graph_columns(graph)
+
+    return graph, NameTable(output_names)
+
+####################################################################################
+#  Compiled LUT cache
+#  Parsed libraries are saved to `.sta_cache/<lib name>.<content hash>.npz` so
+#  later runs on the same (unchanged) .lib file skip parsing entirely.
+####################################################################################
+
+_LUT_ARRAYS = ("input_slews", "load_capacitance", "ost_input_slews", "ost_load_capacitance",
+               "delay_table", "output_slew_table", "cell_rise", "cell_fall", "rise_transition", "fall_transition")
+
+
+def _cache_path(SOURCE_FILE:str, digest:str, extension:str):
+    """Cache file for SOURCE_FILE with content hash `digest`."""
+    cache_dir = os.path.join(os.path.dirname(os.path.abspath(SOURCE_FILE)), CACHE_DIR_NAME)
+    return os.path.join(cache_dir, f"{os.path.basename(SOURCE_FILE)}.{digest[:16]}{extension}")
+
+
+def _lut_shared_index(lut):
+    return (lut.input_slews is None or
+            (np.array_equal(lut.input_slews, lut.ost_input_slews) and
+             np.array_equal(lut.load_capacitance, lut.ost_load_capacitance)))
+
+
+def save_lut_cache(CACHE_FILE:str, luts):
+    """
+    Writes a dict of LUT objects to a .npz file.
+
+    All index/table arrays of all cells are packed into one flat `data` array,
+    with their shapes in `shapes` ([-1, -1] for a missing array), so the file 
+    only has a handful of members however many cells the library has.
+    """
+    shapes = np.full((len(luts), len(_LUT_ARRAYS), 2), -1, dtype=np.int64)
+    data   = []
+    for i, lut in enumerate(luts.values()):
+        for j, field in enumerate(_LUT_ARRAYS):
+            value = getattr(lut, field)
+            if value is not None:
+                shapes[i, j] = value.shape if value.ndim == 2 else (len(value), 0)
+                data.append(value.ravel())
+
+    os.makedirs(os.path.dirname(CACHE_FILE), exist_ok=True)
+    with open(CACHE_FILE, 'wb') as f:
+        np.savez(f,
+                 version     = np.array(LIBERTY_CACHE_VERSION),
+                 cells       = np.array(list(luts), dtype=str),
+                 capacitance = np.array([lut.capacitance for lut in luts.values()], dtype=np.float64),
+                 sense       = np.array([lut.timing_sense for lut in luts.values()], dtype=str),
+                 shapes      = shapes,
+                 data        = np.concatenate(data) if data else np.zeros(0))
+
+
+def load_lut_cache(CACHE_FILE:str):
+    """Reads a dict of LUT objects written by save_lut_cache(). Returns None if the file is from another version."""
+    with np.load(CACHE_FILE, allow_pickle=False) as f:
+        if int(f["version"]) != LIBERTY_CACHE_VERSION:
+            return None
+        cells, capacitance, shapes, data = f["cells"].tolist(), f["capacitance"], f["shapes"], f["data"]
+        sense = f["sense"].tolist()
+
+    luts   = {}
+    offset = 0
+    for i, cell_name in enumerate(cells):
+        lut = LUT()
+        lut.cell_name   = cell_name
+        lut.capacitance = float(capacitance[i])
+        lut.timing_sense = sense[i]
+        for j, field in enumerate(_LUT_ARRAYS):
+            rows, cols = shapes[i, j].tolist()
+            if rows < 0:
+                continue
+            size = rows * cols if cols else rows
+            value = data[offset:offset + size]
+            setattr(lut, field, value.reshape(rows, cols) if cols else value)
+            offset += size
+        lut.shared_index = _lut_shared_index(lut)
+        luts[cell_name] = lut
+
+    return luts
+
+
+def save_levels_cache(CACHE_FILE:str, order, level):
+    """Writes the topological order and logic levels of a netlist to a .npz file."""
+    os.makedirs(os.path.dirname(CACHE_FILE), exist_ok=True)
+    with open(CACHE_FILE, 'wb') as f:
+        np.savez(f, version=np.array(LEVELS_CACHE_VERSION), topo_order=order, level=level)
+
+
+def load_levels_cache(CACHE_FILE:str, num_nodes:int):
+    """
+    Reads (topo_order, level) written by save_levels_cache().
+    Returns None if the file is from another version or another netlist size.
+    """
+    with np.load(CACHE_FILE, allow_pickle=False) as f:
+        if int(f["version"]) != LEVELS_CACHE_VERSION or len(f["level"]) != num_nodes:
+            return None
+        return f["topo_order"], f["level"]
+
+
+####################################################################################
+#  Compiled netlist
+#  `main_sta.py --compile` saves the compiled graph of a .bench file to 
+#  `.sta_cache/<bench name>.<content hash>.netlist`. Layout :
+#      8 bytes   NETLIST_MAGIC
+#      8 bytes   header length (little endian)
+#      header    JSON : version, source hash, gate type names, and the dtype,
+#                shape and byte offset of every array
+#      arrays    raw little endian data, each aligned to NETLIST_ALIGN bytes
+#  Arrays are memory-mapped on load, so only the pages actually used are read.
+####################################################################################
+
+_NETLIST_ARRAYS = ("gate_type", "fanin_ptr", "fanin_idx", "fanout_ptr", "fanout_idx", "fanout_pin",
+                   "outputs", "topo_order", "level")
+
+
+def _netlist_path(BENCH_FILE:str, digest:str):
+    return _cache_path(BENCH_FILE, digest, ".netlist")
+
+
+def save_compiled_netlist(NETLIST_FILE:str, graph, output_names, digest:str):
+    """
+    Writes a compiled TimingGraph (structure and levelization only, no timing) to NETLIST_FILE.
+
+    @param[in] output_names Names of all OUTPUT lines (list or NameTable), including ones that are never defined.
+    @param[in] digest       sha1 of the .bench file the graph was built from.
+    """
+    topological_order(graph)
+    arrays = {field: np.ascontiguousarray(getattr(graph, field)) for field in _NETLIST_ARRAYS}
+    output_names = NameTable(output_names)
+    arrays["names_blob"],   arrays["names_offsets"]  = graph.names.blob, graph.names.offsets
+    arrays["output_blob"],  arrays["output_offsets"] = output_names.blob, output_names.offsets
+
+    layout = {}
+    offset = 0
+    for field, value in arrays.items():
+        offset = -(-offset // NETLIST_ALIGN) * NETLIST_ALIGN
+        layout[field] = {"dtype": value.dtype.newbyteorder('<').str, "shape": list(value.shape), "offset": offset}
+        offset += value.nbytes
+
+    header = json.dumps({
+        "version"    : NETLIST_VERSION,
+        "source"     : digest,
+        "num_nodes"  : graph.num_nodes,
+        "type_names" : graph.type_names,
+        "arrays"     : layout,
+    }).encode()
+    data_start = -(-(16 + len(header)) // NETLIST_ALIGN) * NETLIST_ALIGN
+
+    os.makedirs(os.path.dirname(NETLIST_FILE), exist_ok=True)
+    with open(NETLIST_FILE, 'wb') as f:
+        f.write(NETLIST_MAGIC)
+        f.write(len(header).to_bytes(8, 'little'))
+        f.write(header)
+        for field, value in arrays.items():
+            f.seek(data_start + layout[field]["offset"])
+            f.write(value.astype(layout[field]["dtype"], copy=False).tobytes())
+
+
+def load_compiled_netlist(NETLIST_FILE:str, digest=None):
+    """
+    Reads a file written by save_compiled_netlist().
+
+    Arrays are read-only memory maps of the file.
+
+    @param[in] digest If given, the file must have been built from a .bench file with this sha1.
+    @return (TimingGraph, output NameTable), or None if the file is not a compiled 
+            netlist of this version (or of this source).
+    """
+    with open(NETLIST_FILE, 'rb') as f:
+        if f.read(8) != NETLIST_MAGIC:
+            return None
+        header_length = int.from_bytes(f.read(8), 'little')
+        header = json.loads(f.read(header_length))
+    if header["version"] != NETLIST_VERSION or (digest is not None and header["source"] != digest):
+        return None
+    data_start = -(-(16 + header_length) // NETLIST_ALIGN) * NETLIST_ALIGN
+
+    arrays = {}
+    for field, layout in header["arrays"].items():
+        dtype, shape = np.dtype(layout["dtype"]), tuple(layout["shape"])
+        if not np.prod(shape):
+            arrays[field] = np.zeros(shape, dtype=dtype)
+        else:
+            arrays[field] = np.memmap(NETLIST_FILE, dtype=dtype, mode='r', 
+                                      offset=data_start + layout["offset"], shape=shape)
+
+    graph = TimingGraph()
+    for field in _NETLIST_ARRAYS:
+        setattr(graph, field, arrays[field])
+    graph.names      = NameTable.from_arrays(arrays["names_blob"], arrays["names_offsets"])
+    graph.type_names = header["type_names"]
+    output_names     = NameTable.from_arrays(arrays["output_blob"], arrays["output_offsets"])
+
+    return graph, output_names
 
-                node = nodes[out_name]
-                
-                # Update fan_outs and set arrival_time and input_slew for INPUT nodes
-                node.fan_ins = [nodes[in_name] for in_name in in_names if in_name in nodes]
-                [inp_node.fan_outs.append(node) for inp_node in node.fan_ins]
 
 ####################################################################################
 #     SECTION 4 : Static TIming analysis function definitions
 ####################################################################################
 
 # Sets load capacitance for each node(gate)
-def set_load_capacitance(nodes_set):
+def resolve_cell(gate_type:str, gate_name=None, arity=None):
+    """
+    LUT of the library cell used for a .bench gate type.
+
+    @param[in] gate_name Only used in the error message.
+    @param[in] arity     Number of inputs. If given, the cell of that width is 
+                         used (see library_cells()) instead of the 
+                         GATE_TYPE_TO_LUT_NAME one.
+    @throws ValueError for gate types without a cell, or cells missing from the NLDM file.
+    """
+    where = f" (gate '{gate_name}')" if gate_name is not None else ""
+    cell_name = GATE_TYPE_TO_LUT_NAME.get(gate_type)
+    if cell_name is None:
+        raise ValueError(f"Unknown gate type '{gate_type}'{where}")
+    if arity is not None:
+        widths = library_cells(gate_type)
+        if widths and arity not in widths:
+            raise ValueError(f"No {arity} input cell for gate type '{gate_type}'{where} in the NLDM library")
+        cell_name = widths.get(arity, cell_name)
+    lut = LUT_nodes_set.get(cell_name)
+    if lut is None:
+        raise ValueError(f"Cell '{cell_name}' for gate type '{gate_type}'{where} is not in the NLDM library")
+    return lut
+
+
+def bind_node_cells(nodes_set):
+    """
+    Binds every gate to its library cell (`node.lut`) once, so the timing 
+    passes do no gate type / cell name lookups. Fails on the first gate whose
+    type has no cell.
+    """
+    luts = {}
+    for node in nodes_set.values():
+        if node.gate_type == "INPUT":
+            continue
+        if node.gate_type not in luts:
+            luts[node.gate_type] = resolve_cell(node.gate_type, node.name)
+        node.lut = luts[node.gate_type]
+
+
+def default_output_load():
+    """Load on primary outputs when none is given : PO_LOAD_INV_X1 INV_X1 inputs."""
+    return PO_LOAD_INV_X1 * float(LUT_nodes_set['INV_X1'].capacitance)
+
+
+def build_node_arcs(nodes_set):
+    """
+    Creates one TimingArc per input pin of every gate, so the timing passes 
+    know exactly which pin a fan-out edge is (a net may drive two pins of the
+    same gate) without searching `fan_ins`.
+    """
+    for node in nodes_set.values():
+        node.fan_out_arcs = []
+    for node in nodes_set.values():
+        node.fan_in_arcs = [TimingArc(fan_in, node, pin) for pin, fan_in in enumerate(node.fan_ins)]
+        for arc in node.fan_in_arcs:
+            arc.driver.fan_out_arcs.append(arc)
+
+
+def set_load_capacitance(nodes_set, po_load=None):
+    """
+    Binds cells (bind_node_cells()), builds timing arcs (build_node_arcs()), 
+    sets load capacitance for each node using Cload_calculations() method and
+    updates the output nodes.
+
+    @param[in] po_load Load on every primary output (default_output_load() if None).
     """
-    Sets load capacitance for each node using Cload_calculations() method.
-    and updates the output nodes."""
     
-    [node.Cload_calculations() for node in nodes_set.values() if node.name not in [output_node.name for output_node in outputs_list]]
+    bind_node_cells(nodes_set)
+    build_node_arcs(nodes_set)
+    output_names = {output_node.name for output_node in outputs_list}
+    [node.Cload_calculations() for node in nodes_set.values() if node.name not in output_names]
     
     # Setting Load Capacitance for each node in Output list.
-    #  Cload for output node = 4 * capacitance of Inverter from NLDM file
-    [setattr(nodes[output_node.name], 'Cload', 4 * float(LUT_nodes_set['INV_X1'].capacitance)) for output_node in outputs_list if output_node.name in nodes]
+    #  Cload for output node = 4 * capacitance of Inverter from NLDM file, unless given
+    #  A set_load constraint (Node.po_load) wins.
+    po_load = default_output_load() if po_load is None else po_load
+    for output_node in outputs_list:
+        node = nodes.get(output_node.name)
+        if node is not None:
+            node.Cload = po_load if node.po_load is None else node.po_load
 
     # Update the objects in outputs_list with the corresponding nodes from the nodes dictionary
     for i, output_node in enumerate(outputs_list):
@@ -304,7 +1492,7 @@ def set_load_capacitance(nodes_set):
 # Calculates arrival timings at each node.
 # Uses Topological traversal and DAG algorithm to assign 
 # cell delay, output arrival time and output slew.
-def Compute_arrival_timing(graph):
+def Compute_arrival_timing(graph, record_worst_pin=False):
     """
         Calculates arrival timings at each node.
         Uses Topological traversal and DAG algorithm to assign 
@@ -312,65 +1500,45 @@ def Compute_arrival_timing(graph):
 
         @brief Calculates output arrival-time, output slew and cell delay for each node.
 
-        @param[in] graph List of Nodes.
+        @param[in] graph            List of Nodes.
+        @param[in] record_worst_pin Also set `worst_fan_in` of every node to the fan-in
+                                    whose pin set `a_out` (see Trace_worst_path()).
 
         @details Uses DAG and Topological traversal to create graph like structure
                  to calculate above said values.
 
     """
 
-    in_degree = {node.name: len(node.fan_ins) for node in graph.values()}
-    queue = deque([node.name for node in graph.values() if in_degree[node.name] == 0])
-
-    while queue:
-        node_name = queue.popleft()
-        node = graph[node_name]
+    for node in _node_topological_order(graph):
 
         if node.gate_type == "INPUT":
-            # INPUT nodes have fixed values
-            node.a_out = 0 
-            node.t_out = 0.002
+            # INPUT nodes have fixed values (PI_ARRIVAL_TIME / PI_SLEW unless constrained)
+            node.a_out = node.pi_arrival
+            node.t_out = node.pi_slew
             node._cell_delay = [0 for _ in range(len(node.fan_outs) + 1)] 
         else:
-            # Compute output arrival time (a_out)
-            gate_type_to_lut_name = {
-            'NAND' : 'NAND2_X1',
-            'NOR'  : 'NOR2_X1',
-            'AND'  : 'AND2_X1',
-            'OR'   : 'OR2_X1',
-            'XOR'  : 'XOR2_X1',
-            'INV'  : 'INV_X1',
-            'NOT'  : 'INV_X1',
-            'BUF'  : 'BUF_X1',
-            'BUFF'  : 'BUF_X1',
-        }
-            gate_type = node.gate_type
-            lut_key = gate_type_to_lut_name[gate_type]
-            lut = LUT_nodes_set[lut_key]
-
-            node._cell_delay = [
-                lut.interpolate_table(lut.delay_table, node.input_slew[i], node.Cload)
+            # Compute output arrival time (a_out), cell and arcs set up by set_load_capacitance()
+            lut = node.lut
+            node.arrival_time = [arc.driver.a_out for arc in node.fan_in_arcs]
+            node.input_slew   = [arc.driver.t_out for arc in node.fan_in_arcs]
+
+            # Delay and output slew of every pin from one fused lookup.
+            _lookups = [
+                lut.interpolate_delay_slew(node.input_slew[i], node.Cload)
                 for i in range(len(node.input_slew))
             ]
+            for arc, (delay, t_out) in zip(node.fan_in_arcs, _lookups):
+                arc.delay, arc.slew = delay, t_out
+            node._cell_delay = [delay for delay, _ in _lookups]
 
             node._a_out = [node.arrival_time[i] + node._cell_delay[i] for i in range(len(node.arrival_time))]
             node.a_out = max(node._a_out)
+            if record_worst_pin:
+                node.worst_fan_in = node.fan_in_arcs[max(range(len(node._a_out)), key=node._a_out.__getitem__)].driver
 
-            _t_out = [
-                lut.interpolate_table(lut.output_slew_table, node.input_slew[i], node.Cload)
-                for i in range(len(node.input_slew))
-            ]
+            _t_out = [t_out for _, t_out in _lookups]
             node.t_out = max(_t_out)
 
-        for fan_out in node.fan_outs:
-            fan_out.arrival_time.append(node.a_out)
-            fan_out.input_slew.append(node.t_out)
-            in_degree[fan_out.name] -= 1
-
-            # Add node to queue if all outnodes have been procesed.
-            if in_degree[fan_out.name] == 0:
-                queue.append(fan_out.name)
-
 
 # Calculates Required time for each node.
 def Compute_Required_Time(nodes, file=None):
@@ -380,31 +1548,24 @@ def Compute_Required_Time(nodes, file=None):
     Calculates required time for each node and calculates slack for current node using
     Req. arrival time and output arrival time of current node.
 
-    First calculates the circuit delay to find Output required time from OUTPUT nodes.
+    First calculates the circuit delay to find Output required time from OUTPUT nodes
+    (the clock period if one was set, see apply_node_constraints(), else 1.1 * the 
+    latest output arrival); outputs require `circuit delay - po_delay`.
     
-    Required_arrival_time at gate = minimum of (Req. arrival time at fan_out node - cell delay of current node.)
+    Required_arrival_time at gate = minimum of (Req. arrival time at fan_out node - delay of the arc from current node.)
     Slack  = Required_arrival_time - output_arrival_time of node
 
     @param:in nodes List of all nodes in .bench file.
     """
 
-    max_delay = 0 
-    for node in outputs_list:
-        if node.a_out > max_delay:
-            max_delay = node.a_out
-
-    circuit_delay = 1.1 * max_delay
+    circuit_delay = _reference_delay(clock_period, [node.a_out for node in outputs_list])
     debugpy.breakpoint()
 
     for node in outputs_list:
-        node.required_time = circuit_delay
-
-    in_degree = {node.name: len(node.fan_outs) for node in nodes.values()}
-    queue = deque([node.name for node in outputs_list])
+        node.required_time = circuit_delay - node.po_delay
 
-    while queue:
-        node_name = queue.popleft()
-        node = nodes[node_name]
+    # Reverse topological order : every node is visited after all of its fan-outs.
+    for node in reversed(_node_topological_order(nodes)):
 
         if node.gate_type != "OUTPUT":
             
@@ -412,28 +1573,20 @@ def Compute_Required_Time(nodes, file=None):
             # So required time of INPUT is simply the min of its fan_outs.
             # Check if the node is both INPUT and OUTPUT
             if node.gate_type == "INPUT" and node in outputs_list:
-                node.required_time = circuit_delay
+                node.required_time = circuit_delay - node.po_delay
             
             elif node.gate_type == "INPUT":
                 node.required_time = min(
-                    [fan_out.required_time - (fan_out._cell_delay[fan_out.fan_ins.index(node)] if fan_out._cell_delay else 0) for fan_out in node.fan_outs]
+                    [arc.sink.required_time - (arc.delay if arc.delay is not None else 0) for arc in node.fan_out_arcs]
                 )
             
-            elif node.fan_outs:
+            elif node.fan_out_arcs:
                 node.required_time = min(
-                    [fan_out.required_time - (fan_out._cell_delay[fan_out.fan_ins.index(node)] if fan_out._cell_delay else 0) for fan_out in node.fan_outs]
+                    [arc.sink.required_time - (arc.delay if arc.delay is not None else 0) for arc in node.fan_out_arcs]
                 )
 
             else:
-                node.required_time = circuit_delay  
-
-        # Propagate to fan-in nodes
-        for fan_in in node.fan_ins:
-            in_degree[fan_in.name] -= 1
-
-            # If all fan-outs are processed, add to queue
-            if in_degree[fan_in.name] == 0:
-                queue.append(fan_in.name)
+                node.required_time = circuit_delay - node.po_delay
 
     for node in nodes.values():
         node.slack = node.required_time - node.a_out
@@ -441,12 +1594,13 @@ def Compute_Required_Time(nodes, file=None):
     return circuit_delay
 
 # Finds Critical Path of CKT.
-def Find_critical_path(output_list, file=None):
+def Find_critical_path(output_list, file=None, title="CRITICAL PATH"):
 
     """
     Finds Critical path of the circuit.
 
     @param[in] output_list List of all OUTPUT nodes in .bench file.
+    @param[in] title       Section title in the report file.
 
     Start with primary OUTPUT with least amount of slack and traverse backwards 
     selecting gates connected to the output with minimum slack till we reach 
@@ -470,7 +1624,7 @@ def Find_critical_path(output_list, file=None):
         file.write("\n")
         file.write('-' * 70)
         file.write("\n")
-        file.write("\t \t CRITICAL PATH")
+        file.write(f"\t \t {title}")
         file.write("\n")
         file.write('-' * 70)
         file.write("\n")
@@ -485,10 +1639,44 @@ def Find_critical_path(output_list, file=None):
     # for node in critical_path:
     #     print(f"{node.gate_type}-{node.name}", file=file)
 
+def Trace_worst_path(node):
+    """
+    Worst path ending at `node`, following the `worst_fan_in` recorded by the 
+    arrival pass. O(path depth), no slacks are looked at.
+
+    @param[in] node Node (or NodeView) to trace back from.
+    @return List of nodes from primary INPUT to `node`.
+    """
+    path = [node]
+    while node.worst_fan_in is not None:
+        node = node.worst_fan_in
+        path.append(node)
+    path.reverse()
+    return path
+
+
+def Find_endpoint_paths(output_list, file, title="WORST PATH TO"):
+    """
+    Writes the worst path to every primary output, traced with Trace_worst_path().
+
+    @param[in] output_list List of all OUTPUT nodes in .bench file.
+    @param[in] title       Section title, followed by the output name.
+    """
+    for output in output_list:
+        file.write("\n")
+        file.write('-' * 70)
+        file.write("\n")
+        file.write(f"\t \t {title} {output.name} : slack {output.slack * 1000} ps")
+        file.write("\n")
+        file.write('-' * 70)
+        file.write("\n")
+        for node in Trace_worst_path(output):
+            file.write(f"{node.gate_type}-{node.name}\n")
+
+
 def Save_circuit_details(file_path, nodes, outputs_list):
     with open(file_path, 'w') as file:
-        max_delay = max(node.a_out for node in outputs_list)
-        circuit_delay = 1.1 * max_delay
+        circuit_delay = _reference_delay(clock_period, [node.a_out for node in outputs_list])
         file.write(f"Circuit Delay: {circuit_delay * 1000} ps\n\n")
         
         file.write("\n")
@@ -514,15 +1702,2265 @@ def Save_circuit_details(file_path, nodes, outputs_list):
 ####################################################################################
 
 # Get data from .bench file into objects 
-def get_bench_nodes(FILE):
-    create_nodes(FILE)
-    set_nodes(FILE)
+#   The topological order and logic levels are cached (keyed by a hash of the 
+#   file contents) next to the .bench file, and reused by every timing pass.
+#   If the file was compiled with compile_bench() (`main_sta.py --compile`),
+#   the nodes are rebuilt from the compiled netlist instead of parsing the text.
+def get_bench_nodes(FILE, use_cache=True):
+    global topo_order, node_level, compiled_graph
+
+    with open(FILE, 'rb') as f:
+        digest = hashlib.sha1(f.read()).hexdigest()
+
+    NETLIST_FILE = _netlist_path(FILE, digest)
+    if use_cache and os.path.exists(NETLIST_FILE):
+        compiled = load_compiled_netlist(NETLIST_FILE, digest)
+        if compiled is not None:
+            compiled_graph = compiled[0]
+            nodes_from_graph(*compiled)
+            topo_order, node_level = compiled_graph.topo_order, compiled_graph.level
+            print("Nodes created and set successfully.")
+            return
+
+    compiled_graph = None
+    parse_bench_file(FILE)
+    topo_order, node_level = _cached_levels(FILE, digest, len(nodes), lambda: levelize_nodes(nodes), use_cache)
     print("Nodes created and set successfully.")
 
-# Get data from NLDM file into LUT objects
-def get_nldm_data(NLDM_FILE:str) :
-    print_nldm_output_slew_table(NLDM_FILE)
-    nldm_cell_delay_table(NLDM_FILE)
-    print("NLDM data extracted successfully.")
+
+def _cached_levels(FILE, digest, num_nodes, levelize_function, use_cache=True):
+    """(topo_order, level) of a .bench file, from the levelization cache or from `levelize_function()`."""
+    CACHE_FILE = _cache_path(FILE, digest, ".levels.npz")
+    levels = None
+    if use_cache and os.path.exists(CACHE_FILE):
+        levels = load_levels_cache(CACHE_FILE, num_nodes)
+
+    if levels is None:
+        levels = levelize_function()
+        if use_cache:
+            try:
+                save_levels_cache(CACHE_FILE, *levels)
+            except OSError as e:
+                print(f"Could not write levelization cache {CACHE_FILE} : {e}")
+
+    return levels
+
+
+def get_timing_graph(FILE, use_cache=True):
+    """
+    TimingGraph for a .bench file, without building Node objects. Loaded 
+    straight from the compiled netlist when there is an up to date one, 
+    otherwise parsed with parse_bench_graph().
+    """
+    with open(FILE, 'rb') as f:
+        digest = hashlib.sha1(f.read()).hexdigest()
+
+    NETLIST_FILE = _netlist_path(FILE, digest)
+    if use_cache and os.path.exists(NETLIST_FILE):
+        compiled = load_compiled_netlist(NETLIST_FILE, digest)
+        if compiled is not None:
+            print("Nodes created and set successfully.")
+            return graph_from_compiled(compiled[0])
+
+    graph, _ = parse_bench_graph(FILE)
+
+    def levelize_graph():
+        topological_order(graph)
+        return graph.topo_order, graph.level
+
+    graph.topo_order, graph.level = _cached_levels(FILE, digest, graph.num_nodes, levelize_graph, use_cache)
+    print("Nodes created and set successfully.")
+    return graph
+
+
+def compile_bench(FILE):
+    """
+    Parses a .bench file and saves its compiled netlist next to it (see save_compiled_netlist()).
+
+    @return Path of the compiled netlist.
+    """
+    with open(FILE, 'rb') as f:
+        digest = hashlib.sha1(f.read()).hexdigest()
+
+    graph, output_names = parse_bench_graph(FILE)
+    NETLIST_FILE = _netlist_path(FILE, digest)
+    save_compiled_netlist(NETLIST_FILE, graph, output_names, digest)
+    return NETLIST_FILE
+
+# Get data from NLDM file into LUT objects
+#   The parsed library is cached (keyed by a hash of the file contents), so
+#   running again on the same .lib file loads the LUTs without parsing it.
+def get_nldm_data(NLDM_FILE:str, use_cache=True) :
+    LUT_nodes_set.update(load_nldm_luts(NLDM_FILE, use_cache))
+    print("NLDM data extracted successfully.")
+
+
+def load_nldm_luts(NLDM_FILE:str, use_cache=True):
+    """
+    Cell name -> LUT dict of a .lib file (through the cache), without touching
+    `LUT_nodes_set`. get_nldm_data() and get_corner_libraries() use it.
+    """
+    with open(NLDM_FILE, 'rb') as f:
+        file_content = f.read()
+
+    CACHE_FILE = _cache_path(NLDM_FILE, hashlib.sha1(file_content).hexdigest(), ".npz")
+    luts = None
+    if use_cache and os.path.exists(CACHE_FILE):
+        luts = load_lut_cache(CACHE_FILE)
+
+    if luts is None:
+        luts = build_luts(parse_liberty(file_content.decode()))
+        if use_cache:
+            try:
+                save_lut_cache(CACHE_FILE, luts)
+            except OSError as e:
+                print(f"Could not write NLDM cache {CACHE_FILE} : {e}")
+
+    return luts
+
+
+####################################################################################
+#     SECTION 6 : Compiled timing graph
+#  Integer-indexed CSR version of the STA flow in SECTION 4.
+####################################################################################
+
+def compile_timing_graph(nodes_set, output_nodes):
+    """
+    Builds a TimingGraph from the `nodes` dict and `outputs_list`.
+
+    Node IDs follow the order of `nodes_set`, input pins follow the order of 
+    each node's `fan_ins`, and fan-outs are listed in the same order as each 
+    node's `fan_outs` (the order of the gate lines in the .bench file).
+
+    @param[in] nodes_set    Dict of Nodes (`nodes`).
+    @param[in] output_nodes List of OUTPUT nodes (`outputs_list`).
+    """
+    if (nodes_set is nodes and output_nodes is outputs_list and 
+            compiled_graph is not None and compiled_graph.num_nodes == len(nodes_set)):
+        return graph_from_compiled(compiled_graph)
+
+    graph = TimingGraph()
+    graph.names = NameTable(nodes_set)
+
+    type_codes = {}
+    gate_type  = np.empty(graph.num_nodes, dtype=np.int8)
+    fanin_ptr  = np.zeros(graph.num_nodes + 1, dtype=np.int32)
+    fanin_idx  = []
+    for node_id, node in enumerate(nodes_set.values()):
+        if node.gate_type not in type_codes:
+            type_codes[node.gate_type] = len(graph.type_names)
+            graph.type_names.append(node.gate_type)
+        gate_type[node_id] = type_codes[node.gate_type]
+        fanin_idx.extend(graph.ids[fan_in.name] for fan_in in node.fan_ins)
+        fanin_ptr[node_id + 1] = len(fanin_idx)
+
+    graph.gate_type = gate_type
+    graph.fanin_ptr = fanin_ptr
+    graph.fanin_idx = np.array(fanin_idx, dtype=np.int32)
+    _build_fanouts(graph)
+
+    graph.outputs = np.array([graph.ids[node.name] for node in output_nodes if node.name in graph.ids], dtype=np.int32)
+
+    # Node IDs are positions in `nodes`, so the levelization from get_bench_nodes() carries over.
+    if nodes_set is nodes and node_level is not None and len(node_level) == graph.num_nodes:
+        graph.topo_order = np.array(topo_order, dtype=np.int32)
+        graph.level      = np.array(node_level, dtype=np.int32)
+
+    _init_graph_columns(graph)
+    return graph
+
+
+def _init_graph_columns(graph):
+    """Fills the per-node columns that only depend on the structure (`is_output`, primary input timing)."""
+    graph.is_output = np.zeros(graph.num_nodes, dtype=bool)
+    graph.is_output[graph.outputs] = True
+
+    graph.pi_arrival = np.full(graph.num_nodes, PI_ARRIVAL_TIME, dtype=np.float64)
+    graph.pi_slew    = np.full(graph.num_nodes, PI_SLEW, dtype=np.float64)
+
+
+def _timing_column(graph, field, size, fill, dtype=np.float64):
+    """
+    Column `field` of the graph filled with `fill`. The existing array is 
+    reused (written in place) when it fits, so a graph attached to shared 
+    memory (attach_timing_graph()) keeps its results in the shared block.
+    """
+    column = getattr(graph, field)
+    if not (isinstance(column, np.ndarray) and column.shape == (size,) and 
+            column.dtype == dtype and column.flags.writeable):
+        column = np.empty(size, dtype=dtype)
+        setattr(graph, field, column)
+    column.fill(fill)
+    return column
+
+
+def graph_from_compiled(compiled):
+    """
+    Working copy of a graph from load_compiled_netlist().
+
+    The memory-mapped arrays are copied (they are read-only, and ECO edits 
+    change the structure in place). The name table is shared.
+    """
+    graph = TimingGraph()
+    graph.names      = compiled.names
+    graph.type_names = list(compiled.type_names)
+    for field in _NETLIST_ARRAYS:
+        setattr(graph, field, np.array(getattr(compiled, field)))
+    graph.arc_sink = _arc_sinks(graph)
+    _init_graph_columns(graph)
+    return graph
+
+
+def nodes_from_graph(graph, output_names):
+    """
+    Fills `nodes`, `inputs_list` and `outputs_list` from a compiled graph, 
+    exactly as parse_bench_file() would from the .bench file it came from.
+    """
+    for name, type_code in zip(graph.names, graph.gate_type.tolist()):
+        node = Node()
+        node.name      = name
+        node.gate_type = graph.type_names[type_code]
+        nodes[name] = node
+        if node.gate_type == "INPUT":
+            inputs_list.append(node)
+
+    node_list  = list(nodes.values())
+    fanin_ptr  = graph.fanin_ptr.tolist()
+    fanin_idx  = graph.fanin_idx.tolist()
+    fanout_ptr = graph.fanout_ptr.tolist()
+    fanout_idx = graph.fanout_idx.tolist()
+    for node_id, node in enumerate(node_list):
+        node.fan_ins  = [node_list[fan_in] for fan_in in fanin_idx[fanin_ptr[node_id]:fanin_ptr[node_id + 1]]]
+        node.fan_outs = [node_list[fan_out] for fan_out in fanout_idx[fanout_ptr[node_id]:fanout_ptr[node_id + 1]]]
+
+    for output_name in output_names:
+        node = nodes.get(output_name)
+        if node is None:
+            node = Node()
+            node.name = output_name
+        outputs_list.append(node)
+
+
+def _build_fanouts(graph):
+    """
+    (Re)builds the fan-out CSR arrays (and `arc_sink`) from the fan-in CSR arrays.
+
+    Fan-outs are the input pins grouped by driver. Pins are stored in sink order,
+    so a stable sort keeps every driver's fan-outs in .bench line order.
+    """
+    graph.arc_sink = _arc_sinks(graph)
+    fanout_pin = np.argsort(graph.fanin_idx, kind='stable').astype(np.int32)
+    graph.fanout_pin = fanout_pin
+    graph.fanout_idx = graph.arc_sink[fanout_pin]
+    graph.fanout_ptr = np.zeros(graph.num_nodes + 1, dtype=np.int32)
+    np.cumsum(np.bincount(graph.fanin_idx, minlength=graph.num_nodes), out=graph.fanout_ptr[1:])
+
+
+def _arc_sinks(graph):
+    """Gate of every input pin (timing arc)."""
+    return np.repeat(np.arange(graph.num_nodes, dtype=np.int32), np.diff(graph.fanin_ptr))
+
+
+def _kahn_levels(in_degree, fanout_ptr, fanout_idx):
+    """
+    Kahn's algorithm (FIFO) over plain int lists.
+
+    @param[in] in_degree  Number of fan-ins of every node (modified).
+    @param[in] fanout_ptr CSR offsets of the fan-outs.
+    @param[in] fanout_idx Fan-out node IDs.
+    @return (topological order, logic level) as int32 arrays. Nodes that are 
+            never reached (e.g. on a combinational loop) are left out of the 
+            order and get level -1.
+    """
+    level = [0] * len(in_degree)
+    order = [node_id for node_id in range(len(in_degree)) if in_degree[node_id] == 0]
+    head = 0
+    while head < len(order):
+        node_id = order[head]
+        head += 1
+        next_level = level[node_id] + 1
+        for fan_out in fanout_idx[fanout_ptr[node_id]:fanout_ptr[node_id + 1]]:
+            if level[fan_out] < next_level:
+                level[fan_out] = next_level
+            in_degree[fan_out] -= 1
+            if in_degree[fan_out] == 0:
+                order.append(fan_out)
+
+    level = np.array(level, dtype=np.int32)
+    if len(order) < len(level):
+        reached = np.zeros(len(level), dtype=bool)
+        reached[order] = True
+        level[~reached] = -1
+    return np.array(order, dtype=np.int32), level
+
+
+def levelize_nodes(nodes_set):
+    """
+    Topological order and logic levels of a dict of Nodes, with node IDs being 
+    positions in `nodes_set`. The order is the same FIFO order the arrival 
+    pass has always visited the nodes in.
+
+    @return (topological order, logic level), see _kahn_levels().
+    """
+    ids = {name: node_id for node_id, name in enumerate(nodes_set)}
+    in_degree  = []
+    fanout_ptr = [0]
+    fanout_idx = []
+    for node in nodes_set.values():
+        in_degree.append(len(node.fan_ins))
+        fanout_idx.extend(ids[fan_out.name] for fan_out in node.fan_outs)
+        fanout_ptr.append(len(fanout_idx))
+    return _kahn_levels(in_degree, fanout_ptr, fanout_idx)
+
+
+def _node_topological_order(nodes_set):
+    """Nodes of `nodes_set` in topological order, from the get_bench_nodes() cache when it applies."""
+    if nodes_set is nodes and node_level is not None and len(node_level) == len(nodes_set):
+        order = topo_order
+    else:
+        order, _ = levelize_nodes(nodes_set)
+    node_list = list(nodes_set.values())
+    return [node_list[node_id] for node_id in order.tolist()]
+
+
+def topological_order(graph):
+    """
+    Returns node IDs in topological order (Kahn's algorithm on the CSR arrays).
+
+    Nodes are visited in the same FIFO order as Compute_arrival_timing() visits 
+    the Node objects. The order and the logic levels are computed once and kept
+    on the graph (`topo_order`, `level`); edits that break them reset both.
+    """
+    if graph.topo_order is None:
+        graph.topo_order, graph.level = _kahn_levels(np.diff(graph.fanin_ptr).tolist(),
+                                                     graph.fanout_ptr.tolist(),
+                                                     graph.fanout_idx.tolist())
+    return graph.topo_order
+
+
+def bind_cells(graph, arity_aware=False):
+    """
+    Resolves every gate of the graph to its library cell, once.
+
+    Fills `graph.cells` (the LUTs used by the design) and `graph.cell`, the 
+    index into `graph.cells` of every node (-1 for INPUT). The timing passes 
+    only use these, so they never touch gate type strings or cell names.
+    Fails on the first gate whose type has no cell.
+
+    With `arity_aware` (or on a graph already decomposed by decompose_wide_gates())
+    the cell also depends on the number of inputs of the gate.
+    """
+    if arity_aware:
+        decompose_wide_gates(graph)
+
+    if not graph.arity_aware:
+        arity = np.zeros(graph.num_nodes, dtype=np.int64)
+    else:
+        arity = np.diff(graph.fanin_ptr).astype(np.int64)
+    key = graph.gate_type.astype(np.int64) * (int(arity.max(initial=0)) + 1) + arity
+    keys, first, inverse = np.unique(key, return_index=True, return_inverse=True)
+
+    graph.cells = []
+    key_cell = np.full(len(keys), -1, dtype=np.int16)
+    for k, node_id in enumerate(first.tolist()):
+        type_name = graph.type_names[graph.gate_type[node_id]]
+        if type_name == "INPUT":
+            continue
+        lut = resolve_cell(type_name, graph.names[node_id], int(arity[node_id]) if graph.arity_aware else None)
+        if lut not in graph.cells:
+            graph.cells.append(lut)
+        key_cell[k] = graph.cells.index(lut)
+
+    graph.cell     = key_cell[inverse.ravel()]
+    graph.cell_cap = np.array([lut.capacitance for lut in graph.cells], dtype=np.float64)
+
+
+def _bound_cells(graph):
+    """`graph.cells`, binding the graph first if bind_cells() has not been run on it."""
+    if graph.cell is None:
+        bind_cells(graph)
+    return graph.cells
+
+
+def _cell_index(graph, lut):
+    """Index of `lut` in `graph.cells`, adding it to the bound cells if it is not used yet."""
+    cells = _bound_cells(graph)
+    if lut not in cells:
+        cells.append(lut)
+        graph.cell_cap = np.append(graph.cell_cap, lut.capacitance)
+    return cells.index(lut)
+
+
+def _node_caps(graph):
+    """Input pin capacitance of every node's cell (0 for nodes without one)."""
+    _bound_cells(graph)
+    return np.append(graph.cell_cap, 0.0)[graph.cell]  # cell -1 picks the appended 0
+
+
+def _load_pins(graph):
+    """
+    (loaded node, cell index) of every fan-out pin, and the nodes that get the 
+    output load instead. A cone (cone_graph()) keeps the pins and outputs of
+    the full graph, so its loads are those of the full graph.
+    """
+    if graph.load_driver is None:
+        _bound_cells(graph)
+        return np.repeat(np.arange(graph.num_nodes), np.diff(graph.fanout_ptr)), graph.cell[graph.fanout_idx], graph.outputs
+    return graph.load_driver, graph.load_cell, graph.load_outputs
+
+
+def _output_load(graph, node_ids, default):
+    """`po_load` of `node_ids`, `default` where no load was set (NaN)."""
+    load = graph.po_load[node_ids]
+    return np.where(np.isnan(load), default, load)
+
+
+def set_load_capacitance_csr(graph, po_load=None):
+    """
+    Same as set_load_capacitance() for a TimingGraph.
+
+    Cload is the sum of the input capacitance of every fan-out, done as one 
+    scatter-add of the fan-out pin capacitances onto their drivers. Primary 
+    outputs get `graph.po_load` instead.
+
+    @param[in] po_load Load on primary outputs : a number, or an array with one
+                       entry per node. Kept in `graph.po_load`; if None the 
+                       previous value is kept. Outputs without a load (NaN)
+                       get default_output_load().
+    """
+    if po_load is not None:
+        graph.po_load = np.broadcast_to(np.asarray(po_load, dtype=np.float64), (graph.num_nodes,)).copy()
+    elif graph.po_load is None or len(graph.po_load) != graph.num_nodes:
+        graph.po_load = np.full(graph.num_nodes, np.nan)
+
+    drivers, cells, load_outputs = _load_pins(graph)
+    Cload   = _timing_column(graph, "Cload", graph.num_nodes, 0.0)
+    Cload[:] = np.bincount(drivers, weights=np.append(graph.cell_cap, 0.0)[cells], minlength=graph.num_nodes)
+    graph.Cload[load_outputs] = _output_load(graph, load_outputs, default_output_load())
+
+
+def update_load_capacitance(graph, node_ids):
+    """
+    Recomputes Cload of some nodes only (e.g. after a change to their fan-outs),
+    with the same sums as set_load_capacitance_csr().
+
+    @return IDs of the nodes whose Cload changed.
+    """
+    node_ids = np.asarray(node_ids, dtype=np.int64)
+    positions, counts = _csr_positions(graph.fanout_ptr, node_ids)
+    segment = np.repeat(np.arange(len(node_ids)), counts)
+    Cload   = np.bincount(segment, weights=_node_caps(graph)[graph.fanout_idx[positions]], minlength=len(node_ids))
+    Cload   = np.where(graph.is_output[node_ids], _output_load(graph, node_ids, default_output_load()), Cload)
+
+    changed = (Cload != graph.Cload[node_ids]) & ~(np.isnan(Cload) & np.isnan(graph.Cload[node_ids]))
+    graph.Cload[node_ids[changed]] = Cload[changed]
+    return node_ids[changed]
+
+
+def Compute_arrival_timing_csr(graph):
+    """
+    Same as Compute_arrival_timing() for a TimingGraph.
+
+    Fills `arrival`, `slew` and `pin_delay`. Nodes that cannot be reached 
+    (e.g. on a combinational loop) are left as NaN.
+    """
+    luts      = _bound_cells(graph)
+    cell      = graph.cell.tolist()
+    fanin_ptr = graph.fanin_ptr.tolist()
+    fanin_idx = graph.fanin_idx.tolist()
+    Cload     = graph.Cload.tolist()
+    pi_arrival, pi_slew = graph.pi_arrival.tolist(), graph.pi_slew.tolist()
+
+    arrival   = [float('nan')] * graph.num_nodes
+    slew      = [float('nan')] * graph.num_nodes
+    pin_delay = [0.0] * len(fanin_idx)
+    pin_slew  = [0.0] * len(fanin_idx)
+    worst_pin = [-1] * graph.num_nodes
+
+    for node_id in topological_order(graph).tolist():
+        if cell[node_id] < 0 or fanin_ptr[node_id] == fanin_ptr[node_id + 1]:
+            arrival[node_id] = pi_arrival[node_id]
+            slew[node_id]    = pi_slew[node_id]
+            continue
+
+        lut   = luts[cell[node_id]]
+        a_out = None
+        t_out = None
+        for pin in range(fanin_ptr[node_id], fanin_ptr[node_id + 1]):
+            fan_in = fanin_idx[pin]
+            delay, _t_out = lut.interpolate_delay_slew(slew[fan_in], Cload[node_id])
+            pin_delay[pin] = delay
+            pin_slew[pin]  = _t_out
+            _a_out = arrival[fan_in] + delay
+            if a_out is None or _a_out > a_out:
+                a_out = _a_out
+                worst_pin[node_id] = pin - fanin_ptr[node_id]
+            if t_out is None or _t_out > t_out:
+                t_out = _t_out
+
+        arrival[node_id] = a_out
+        slew[node_id]    = t_out
+
+    graph.arrival   = np.array(arrival, dtype=np.float64)
+    graph.slew      = np.array(slew, dtype=np.float64)
+    graph.pin_delay = np.array(pin_delay, dtype=np.float64)
+    graph.pin_slew  = np.array(pin_slew, dtype=np.float64)
+    graph.worst_pin = np.array(worst_pin, dtype=np.int32)
+    graph.lut_edge  = "legacy"
+
+
+def _circuit_delay(graph, arrivals):
+    """_reference_delay() with the clock period of the graph."""
+    return _reference_delay(graph.clock_period, arrivals)
+
+
+def _reference_delay(clock_period, arrivals):
+    """
+    Required time reference of the primary outputs, for every engine : the 
+    clock period if one was set (create_clock, see read_sdc()), else 1.1 * 
+    the latest of `arrivals`.
+    """
+    if clock_period is not None:
+        return float(clock_period)
+
+    max_delay = 0
+    for arrival in arrivals:
+        if arrival > max_delay:
+            max_delay = arrival
+    return 1.1 * max_delay
+
+
+def _output_required(graph, circuit_delay):
+    """
+    Required time of every node as a primary output (and of nodes without 
+    fan-outs) : `circuit_delay - po_delay`.
+    """
+    po_delay = 0.0 if graph.po_delay is None else graph.po_delay
+    return np.full(graph.num_nodes, circuit_delay) - po_delay
+
+
+def Compute_Required_Time_csr(graph):
+    """
+    Same as Compute_Required_Time() for a TimingGraph.
+
+    Nodes are visited in reverse topological order, so a primary output that 
+    also drives other gates is only visited once all of its fan-outs are done.
+    Required time at a node is the minimum over its fan-outs of 
+    (required time of fan-out - delay of the pin it drives).
+    Primary outputs require `circuit delay - po_delay`.
+
+    @return Circuit delay (clock period, or 1.1 * max output arrival time).
+    """
+    circuit_delay = _circuit_delay(graph, graph.arrival[graph.outputs].tolist())
+
+    is_output  = graph.is_output.tolist()
+    fanout_ptr = graph.fanout_ptr.tolist()
+    fanout_idx = graph.fanout_idx.tolist()
+    fanout_pin = graph.fanout_pin.tolist()
+    pin_delay  = graph.pin_delay.tolist()
+
+    required = _output_required(graph, circuit_delay).tolist()
+    for node_id in topological_order(graph)[::-1].tolist():
+        lo, hi = fanout_ptr[node_id], fanout_ptr[node_id + 1]
+        if lo == hi:
+            continue
+        required_time = required[node_id] if is_output[node_id] else float('inf')
+        for k in range(lo, hi):
+            _required = required[fanout_idx[k]] - pin_delay[fanout_pin[k]]
+            if _required < required_time:
+                required_time = _required
+        required[node_id] = required_time
+
+    graph.required = np.array(required, dtype=np.float64)
+    graph.slack    = graph.required - graph.arrival
+    graph.circuit_delay = circuit_delay
+
+    return circuit_delay
+
+
+####################################################################################
+#     SECTION 7 : Levelized (vectorized) STA engine
+#  Propagates a whole topological level at a time with batched NumPy lookups.
+####################################################################################
+
+def _csr_positions(ptr, ids):
+    """
+    Positions of all CSR entries that belong to `ids`, in order.
+
+    e.g. for the fan-in CSR this returns every input pin of the given nodes,
+    grouped by node. Also returns the number of entries per node.
+    """
+    counts = ptr[ids + 1] - ptr[ids]
+    starts = np.repeat(ptr[ids] - (np.cumsum(counts) - counts), counts)
+    return starts + np.arange(counts.sum(), dtype=starts.dtype), counts
+
+
+def levelize(graph):
+    """
+    Splits the graph into topological levels.
+
+    Level 0 holds every node without fan-ins. A node is in level k when its 
+    latest fan-in is in level k-1, so all nodes in a level can be evaluated 
+    together once the previous levels are done. Uses the levels cached on the
+    graph by topological_order().
+
+    @return List of node ID arrays (sorted by ID), one per level.
+    """
+    topological_order(graph)
+    by_level = np.argsort(graph.level, kind='stable').astype(np.int32)
+    counts   = np.bincount(graph.level + 1)
+    bounds   = np.cumsum(counts)
+    return [by_level[bounds[k]:bounds[k + 1]] for k in range(len(counts) - 1)]
+
+
+def _segment_max(values, starts):
+    """
+    Max of every segment `values[..., starts[k]:starts[k+1]]`, with the same NaN 
+    behaviour as Python's max() over the segment : a NaN is only returned 
+    when it is the first value of the segment, any other NaN is skipped.
+    Segments run along the last axis (one row per corner, see SECTION 12).
+    """
+    result = np.fmax.reduceat(values, starts, axis=-1)
+    result[np.isnan(values[..., starts])] = np.nan
+    return result
+
+
+def _segment_min(values, starts):
+    """Min of every segment, with the NaN behaviour of Python's min() (see _segment_max())."""
+    result = np.fmin.reduceat(values, starts, axis=-1)
+    result[np.isnan(values[..., starts])] = np.nan
+    return result
+
+
+def _segment_argmax(values, starts, maxima):
+    """
+    Position (relative to the segment start) of the first value equal to the 
+    segment max from _segment_max(), i.e. the element Python's max() returns.
+    0 for segments whose max is NaN. Given the segment min from _segment_min()
+    it finds the element Python's min() returns.
+    """
+    size     = values.shape[-1]
+    counts   = np.diff(np.append(starts, size))
+    position = np.broadcast_to(np.arange(size), values.shape).copy()
+    position[values != np.repeat(maxima, counts, axis=-1)] = size
+    first = np.minimum.reduceat(position, starts, axis=-1)
+    return np.where(first == size, 0, first - starts)
+
+
+def _evaluate_gates(graph, gates, node_luts, edge):
+    """
+    Arrival, slew and pin delays of `gates` (all fan-ins already timed), written 
+    into the graph columns. Gates only write their own entries, so disjoint 
+    chunks of one level can be evaluated concurrently.
+    """
+    pins, counts = _csr_positions(graph.fanin_ptr, gates)
+    drivers  = graph.fanin_idx[pins]
+    in_slew  = graph.slew[drivers]
+    pin_load = np.repeat(graph.Cload[gates], counts)
+    pin_cell = np.repeat(graph.cell[gates], counts)
+
+    delay    = np.empty(len(pins))
+    out_slew = np.empty(len(pins))
+    for cell in np.unique(pin_cell).tolist():
+        lut  = node_luts[cell]
+        mask = pin_cell == cell
+        delay[mask], out_slew[mask] = lut.interpolate_delay_slew_batch(in_slew[mask], pin_load[mask], edge)
+
+    starts    = np.cumsum(counts) - counts
+    pin_a_out = graph.arrival[drivers] + delay
+    arrival   = _segment_max(pin_a_out, starts)
+    graph.arrival[gates]   = arrival
+    graph.slew[gates]      = _segment_max(out_slew, starts)
+    graph.pin_delay[pins]  = delay
+    graph.pin_slew[pins]   = out_slew
+    graph.worst_pin[gates] = _segment_argmax(pin_a_out, starts, arrival)
+
+
+def Compute_arrival_timing_levelized(graph, edge="legacy", jobs=1):
+    """
+    Vectorized version of Compute_arrival_timing_csr().
+
+    Levelizes the graph once, then for every level :
+        - gathers the (input slew, Cload) pair of every input pin in the level,
+        - interpolates the delay and output slew of all pins of the same cell
+          in one fused LUT.interpolate_delay_slew_batch() call,
+        - reduces pin arrival (driver arrival + delay) and output slew to the 
+          per gate maximum with a segment max over each gate's pins.
+
+    With `jobs` > 1, levels with at least 2 * PARALLEL_MIN_GATES gates are
+    split into min(`jobs`, gates // PARALLEL_MIN_GATES) chunks evaluated by a
+    thread pool (the batched NumPy calls release the GIL); all chunks of a 
+    level finish before the next level starts. Results do not depend on `jobs`.
+
+    With the default `edge` ("legacy") results (`arrival`, `slew`, `pin_delay`) 
+    are bit-identical to Compute_arrival_timing_csr().
+
+    @param[in] edge Table edge handling, see LUT.interpolate_batch().
+    @param[in] jobs Number of worker threads.
+    """
+    if jobs < 1:
+        raise ValueError(f"jobs must be at least 1, got {jobs}")
+
+    node_luts = _bound_cells(graph)
+
+    _timing_column(graph, "arrival",   graph.num_nodes, np.nan)
+    _timing_column(graph, "slew",      graph.num_nodes, np.nan)
+    _timing_column(graph, "pin_delay", len(graph.fanin_idx), 0.0)
+    _timing_column(graph, "pin_slew",  len(graph.fanin_idx), 0.0)
+    _timing_column(graph, "worst_pin", graph.num_nodes, -1, np.int32)
+    graph.lut_edge = edge
+
+    levels = levelize(graph)
+    if levels:
+        graph.arrival[levels[0]] = graph.pi_arrival[levels[0]]
+        graph.slew[levels[0]]    = graph.pi_slew[levels[0]]
+
+    if jobs == 1:
+        for gates in levels[1:]:
+            _evaluate_gates(graph, gates, node_luts, edge)
+        return
+
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        for gates in levels[1:]:
+            num_chunks = min(jobs, len(gates) // PARALLEL_MIN_GATES)
+            if num_chunks < 2:
+                _evaluate_gates(graph, gates, node_luts, edge)
+                continue
+            chunks = np.array_split(gates, num_chunks)
+            # list() waits for every chunk (and re-raises worker errors) : barrier between levels.
+            list(pool.map(lambda chunk: _evaluate_gates(graph, chunk, node_luts, edge), chunks))
+
+
+def Compute_Required_Time_levelized(graph):
+    """
+    Vectorized version of Compute_Required_Time_csr().
+
+    Walks the levels from the last to the first. For the nodes of one level it
+    gathers every fan-out arc (via `fanout_pin`), computes 
+    `required[arc_sink] - pin_delay` for all of them at once, and reduces to 
+    the per-node minimum with a segment min. No per-edge Python work and no 
+    pin searches. Results are bit-identical to Compute_Required_Time_csr().
+
+    @return Circuit delay (clock period, or 1.1 * max output arrival time).
+    """
+    circuit_delay   = _circuit_delay(graph, graph.arrival[graph.outputs].tolist())
+    output_required = _output_required(graph, circuit_delay)
+
+    required = _timing_column(graph, "required", graph.num_nodes, np.nan)
+    required[:] = output_required
+    for nodes_in_level in reversed(levelize(graph)):
+        positions, counts = _csr_positions(graph.fanout_ptr, nodes_in_level)
+        drivers = nodes_in_level[counts > 0]
+        if not drivers.size:
+            continue
+        arcs   = graph.fanout_pin[positions]
+        starts = (np.cumsum(counts) - counts)[counts > 0]
+        # fmin skips NaN like the `<` comparison of the scalar pass; outputs also start from their own required time.
+        _required = np.fmin.reduceat(required[graph.arc_sink[arcs]] - graph.pin_delay[arcs], starts)
+        required[drivers] = np.fmin(_required, np.where(graph.is_output[drivers], output_required[drivers], np.inf))
+
+    np.subtract(required, graph.arrival, out=_timing_column(graph, "slack", graph.num_nodes, np.nan))
+    graph.circuit_delay = circuit_delay
+
+    return circuit_delay
+
+
+####################################################################################
+#     SECTION 8 : Incremental timing
+#  ECO style edits on an analysed TimingGraph. Edits only mark nodes dirty,
+#  update_timing() then re-propagates arrivals through the forward cone and
+#  required times through the backward cone of those nodes.
+####################################################################################
+
+def _node_id(graph, name):
+    if name not in graph.ids:
+        raise ValueError(f"Unknown node '{name}'")
+    return graph.ids[name]
+
+
+def eco_set_cell(graph, node_name:str, gate_type:str):
+    """
+    Changes the gate type (and so the NLDM cell) of a node.
+
+    The node's own delays change, and so does the load seen by its fan-ins.
+    """
+    node_id   = _node_id(graph, node_name)
+    gate_type = gate_type.upper()
+    lut       = None if gate_type == "INPUT" else resolve_cell(gate_type, node_name, _node_arity(graph, node_id))
+
+    if gate_type not in graph.type_names:
+        graph.type_names.append(gate_type)
+    graph.gate_type[node_id] = graph.type_names.index(gate_type)
+
+    graph.cell[node_id] = -1 if lut is None else _cell_index(graph, lut)
+
+    graph.dirty_arrival.add(node_id)
+    graph.dirty_load.update(graph.fan_ins(node_id).tolist())
+
+
+def _node_arity(graph, node_id, change=0):
+    """Fan-in count used to pick the cell of a node (None unless the graph is arity aware)."""
+    if not graph.arity_aware:
+        return None
+    return int(graph.fanin_ptr[node_id + 1] - graph.fanin_ptr[node_id]) + change
+
+
+def _rebind_cell(graph, node_id, change=0):
+    """
+    On arity aware graphs, returns a function that rebinds the cell of a node
+    whose fan-in count changes by `change`. The cell is looked up straight away,
+    so an edit without a matching cell fails before the graph is touched.
+    """
+    if not graph.arity_aware:
+        return lambda: None
+    lut = resolve_cell(graph.type_names[graph.gate_type[node_id]], graph.names[node_id], 
+                       _node_arity(graph, node_id, change))
+
+    def rebind():
+        graph.cell[node_id] = _cell_index(graph, lut)
+    return rebind
+
+
+def _edit_pin_columns(graph, edit):
+    """
+    Applies `edit` (an insert / delete of one pin) to the per-pin timing 
+    columns. They are None until the graph is timed; the timing passes then 
+    size them from `fanin_idx`.
+    """
+    for field in ("pin_delay", "pin_slew"):
+        column = getattr(graph, field)
+        if column is not None:
+            setattr(graph, field, edit(column))
+
+
+def eco_add_fanout(graph, driver_name:str, sink_name:str):
+    """Adds a new input pin on `sink_name`, driven by `driver_name`."""
+    driver, sink = _node_id(graph, driver_name), _node_id(graph, sink_name)
+    if graph.type_names[graph.gate_type[sink]] == "INPUT":
+        raise ValueError(f"Cannot add a fan-in to INPUT '{sink_name}'")
+    if _reaches(graph, sink, driver):
+        raise ValueError(f"Connecting '{driver_name}' to '{sink_name}' would create a combinational loop")
+    rebind = _rebind_cell(graph, sink, +1)
+
+    pin = graph.fanin_ptr[sink + 1]
+    graph.fanin_idx = np.insert(graph.fanin_idx, pin, driver)
+    _edit_pin_columns(graph, lambda column: np.insert(column, pin, 0.0))
+    graph.fanin_ptr[sink + 1:] += 1
+    _build_fanouts(graph)
+    rebind()
+
+    if graph.level is not None and (graph.level[driver] >= graph.level[sink] or
+                                    graph.rank is not None and graph.rank[driver] >= graph.rank[sink]):
+        graph.topo_order = None
+        graph.level      = None
+        graph.rank       = None
+
+    graph.dirty_load.add(driver)
+    graph.dirty_arrival.add(sink)
+    graph.dirty_required.add(driver)
+
+
+def eco_remove_fanout(graph, driver_name:str, sink_name:str):
+    """Removes one input pin of `sink_name` driven by `driver_name`."""
+    driver, sink = _node_id(graph, driver_name), _node_id(graph, sink_name)
+    pins = np.flatnonzero(graph.fan_ins(sink) == driver)
+    if not pins.size:
+        raise ValueError(f"'{driver_name}' does not drive '{sink_name}'")
+    rebind = _rebind_cell(graph, sink, -1)
+
+    pin = graph.fanin_ptr[sink] + pins[-1]
+    graph.fanin_idx = np.delete(graph.fanin_idx, pin)
+    _edit_pin_columns(graph, lambda column: np.delete(column, pin))
+    graph.fanin_ptr[sink + 1:] -= 1
+    _build_fanouts(graph)
+    rebind()
+
+    graph.dirty_load.add(driver)
+    graph.dirty_arrival.add(sink)
+    graph.dirty_required.add(driver)
+
+
+def eco_set_output_load(graph, output_name:str, load:float):
+    """Changes the load on a primary output."""
+    node_id = _node_id(graph, output_name)
+    if not graph.is_output[node_id]:
+        raise ValueError(f"'{output_name}' is not a primary output")
+    if graph.po_load is None:
+        graph.po_load = np.full(graph.num_nodes, np.nan)
+    graph.po_load[node_id] = load
+    graph.dirty_load.add(node_id)
+
+
+def eco_set_input_arrival(graph, input_name:str, arrival=None, slew=None):
+    """Changes the arrival time and/or slew of a primary input."""
+    node_id = _node_id(graph, input_name)
+    if arrival is not None:
+        graph.pi_arrival[node_id] = arrival
+    if slew is not None:
+        graph.pi_slew[node_id] = slew
+    graph.dirty_arrival.add(node_id)
+
+
+def _reaches(graph, source, target):
+    """True if `target` is in the fan-out cone of `source` (or is `source`)."""
+    seen  = {source}
+    stack = [source]
+    while stack:
+        node_id = stack.pop()
+        if node_id == target:
+            return True
+        for fan_out in graph.fan_outs(node_id).tolist():
+            if fan_out not in seen:
+                seen.add(fan_out)
+                stack.append(fan_out)
+    return False
+
+
+def _same_value(a, b):
+    return a == b or (a != a and b != b)
+
+
+def _evaluate_node(graph, node_id, luts):
+    """Recomputes arrival, slew and pin delays of one node from its fan-ins."""
+    cell   = graph.cell[node_id]
+    lo, hi = graph.fanin_ptr[node_id], graph.fanin_ptr[node_id + 1]
+    if cell < 0 or lo == hi:
+        graph.arrival[node_id]   = graph.pi_arrival[node_id]
+        graph.slew[node_id]      = graph.pi_slew[node_id]
+        graph.worst_pin[node_id] = -1
+        return
+
+    drivers = graph.fanin_idx[lo:hi]
+    delay, out_slew = luts[cell].interpolate_delay_slew_batch(graph.slew[drivers], graph.Cload[node_id], graph.lut_edge)
+    first     = np.zeros(1, dtype=np.intp)
+    pin_a_out = graph.arrival[drivers] + delay
+    graph.pin_delay[lo:hi]   = delay
+    graph.pin_slew[lo:hi]    = out_slew
+    graph.arrival[node_id]   = _segment_max(pin_a_out, first)[0]
+    graph.slew[node_id]      = _segment_max(out_slew, first)[0]
+    graph.worst_pin[node_id] = _segment_argmax(pin_a_out, first, graph.arrival[node_id:node_id + 1])[0]
+
+
+def _node_required(graph, node_id):
+    """Required time of one node from its fan-outs, as in Compute_Required_Time_csr()."""
+    output_required = graph.circuit_delay if graph.po_delay is None else graph.circuit_delay - graph.po_delay[node_id]
+    lo, hi = graph.fanout_ptr[node_id], graph.fanout_ptr[node_id + 1]
+    if lo == hi:
+        return output_required
+    required_time = output_required if graph.is_output[node_id] else float('inf')
+    for k in range(lo, hi):
+        _required = graph.required[graph.fanout_idx[k]] - graph.pin_delay[graph.fanout_pin[k]]
+        if _required < required_time:
+            required_time = _required
+    return required_time
+
+
+def update_timing(graph):
+    """
+    Brings the timing of an analysed graph up to date after eco_* edits.
+
+        1. Cload is recomputed for nodes whose fan-outs changed.
+        2. Arrivals are re-propagated from the dirty nodes in topological order.
+           A node's fan-outs are only revisited when its arrival or slew 
+           actually changed, so propagation stops as soon as values settle.
+        3. If the circuit delay (and so every output's required time) changed,
+           required times are recomputed for the whole graph. Otherwise they 
+           are re-propagated backwards from the fan-ins of every gate whose pin
+           delays were recomputed, again stopping where values settle.
+
+    Results are identical to a full set_load_capacitance_csr(), 
+    Compute_arrival_timing_csr() and Compute_Required_Time_csr() run on the 
+    edited graph.
+
+    @return Circuit delay.
+    """
+    luts = _bound_cells(graph)
+    if graph.rank is None:
+        order = topological_order(graph)
+        graph.rank = np.full(graph.num_nodes, graph.num_nodes, dtype=np.int32)
+        graph.rank[order] = np.arange(len(order), dtype=np.int32)
+    rank = graph.rank
+
+    if graph.dirty_load:
+        graph.dirty_arrival.update(update_load_capacitance(graph, sorted(graph.dirty_load)).tolist())
+
+    # Forward cone
+    evaluated = []
+    heap = [(rank[node_id], node_id) for node_id in graph.dirty_arrival]
+    heapq.heapify(heap)
+    queued = set(graph.dirty_arrival)
+    while heap:
+        _, node_id = heapq.heappop(heap)
+        arrival, slew = graph.arrival[node_id], graph.slew[node_id]
+        _evaluate_node(graph, node_id, luts)
+        evaluated.append(node_id)
+
+        if _same_value(arrival, graph.arrival[node_id]) and _same_value(slew, graph.slew[node_id]):
+            continue
+        for fan_out in graph.fan_outs(node_id).tolist():
+            if fan_out not in queued:
+                queued.add(fan_out)
+                heapq.heappush(heap, (rank[fan_out], fan_out))
+
+    # Backward cone
+    if not _same_value(_circuit_delay(graph, graph.arrival[graph.outputs].tolist()), graph.circuit_delay):
+        Compute_Required_Time_csr(graph)
+    else:
+        seeds = set(graph.dirty_required)
+        for node_id in evaluated:
+            seeds.update(graph.fan_ins(node_id).tolist())
+
+        heap = [(-rank[node_id], node_id) for node_id in seeds]
+        heapq.heapify(heap)
+        queued = set(seeds)
+        while heap:
+            _, node_id = heapq.heappop(heap)
+            required = _node_required(graph, node_id)
+            if _same_value(required, graph.required[node_id]):
+                continue
+            graph.required[node_id] = required
+            for fan_in in graph.fan_ins(node_id).tolist():
+                if fan_in not in queued:
+                    queued.add(fan_in)
+                    heapq.heappush(heap, (-rank[fan_in], fan_in))
+
+        graph.slack = graph.required - graph.arrival
+
+    graph.dirty_load.clear()
+    graph.dirty_arrival.clear()
+    graph.dirty_required.clear()
+
+    return graph.circuit_delay
+
+
+def time_fanin_cone(graph, node_id, known, load_known):
+    """
+    Times the nodes of the fan-in cone of `node_id` that are not `known` 
+    (Design). The cone is walked depth first with an explicit stack, so deep
+    netlists do not hit the recursion limit, and every node gets its depth 
+    within the part being timed. Loads (unless `load_known`) are computed with
+    update_load_capacitance(), then the gates are timed one depth at a time 
+    with _evaluate_gates(), as in the levelized pass. Both masks are updated.
+
+    @return Number of nodes timed.
+    """
+    depth   = {}
+    fan_ins = {}
+    stack   = [(node_id, False)]
+    while stack:
+        node, fan_ins_done = stack.pop()
+        if fan_ins_done:
+            depth[node] = 1 + max((depth[fan_in] for fan_in in fan_ins[node] if fan_in in depth), default=0)
+            continue
+        if known[node] or node in fan_ins:
+            continue
+        fan_ins[node] = graph.fan_ins(node).tolist()
+        stack.append((node, True))
+        stack.extend((fan_in, False) for fan_in in fan_ins[node] if not known[fan_in])
+
+    cone  = np.fromiter(depth.keys(), dtype=np.int64, count=len(depth))
+    level = np.fromiter(depth.values(), dtype=np.int64, count=len(depth))
+    loads = cone[~load_known[cone]]
+    if loads.size:
+        update_load_capacitance(graph, loads)
+        load_known[loads] = True
+
+    luts    = _bound_cells(graph)
+    sources = (graph.cell[cone] < 0) | (graph.fanin_ptr[cone + 1] == graph.fanin_ptr[cone])
+    graph.arrival[cone[sources]]   = graph.pi_arrival[cone[sources]]
+    graph.slew[cone[sources]]      = graph.pi_slew[cone[sources]]
+    graph.worst_pin[cone[sources]] = -1
+    gates, level = cone[~sources], level[~sources]
+    order = np.argsort(level, kind="stable")
+    for gates_at_depth in np.split(gates[order], np.flatnonzero(np.diff(level[order])) + 1):
+        if gates_at_depth.size:
+            _evaluate_gates(graph, gates_at_depth, luts, graph.lut_edge)
+    known[cone] = True
+    return len(cone)
+
+
+def forget_fanout_cone(graph, node_ids, known):
+    """
+    Clears `known` for `node_ids` and their fan-out cones. A node is only 
+    known if its fan-ins are, so the walk stops at nodes that are not known.
+    """
+    frontier = np.unique(np.asarray(node_ids, dtype=np.int64))
+    frontier = frontier[known[frontier]]
+    known[frontier] = False
+    while frontier.size:
+        positions, _ = _csr_positions(graph.fanout_ptr, frontier)
+        fan_outs = np.unique(graph.fanout_idx[positions])
+        frontier = fan_outs[known[fan_outs]]
+        known[frontier] = False
+
+
+####################################################################################
+#     SECTION 9 : K worst paths
+#  Enumerates the most critical paths after one timing pass, without re-running STA.
+####################################################################################
+
+def worst_paths(graph, k:int, endpoints=None, early=False):
+    """
+    Returns the `k` most critical input-to-output paths of an analysed graph.
+
+    Best-first search backwards from the endpoints. A partial path is a suffix
+    from some node `v` to an endpoint, with `suffix_delay` being the sum of 
+    the pin delays along it. Its worst possible completion arrives at 
+    `arrival[v] + suffix_delay` (arrival[v] is already the latest arrival at v),
+    so a heap ordered on the slack of that bound (against the required time 
+    of the path's endpoint, `circuit_delay - po_delay`) pops complete paths 
+    in order of increasing slack. Each pop only expands the fan-in
+    pins of one node, so K paths cost about O(K log K * depth) heap work.
+
+    With `early` the paths are the shortest ones of the early (hold) analysis
+    (SECTION 14) : the bound is the earliest completion `early_arrival[v] + 
+    suffix_delay` and slack is path arrival - `hold_required`.
+
+    @param[in] k         Number of paths.
+    @param[in] endpoints Node IDs to start from (all primary outputs by default).
+    @param[in] early     Early (hold) paths instead of late (setup) paths.
+    @return List of (slack, path arrival, [node IDs from input to endpoint]).
+    """
+    if endpoints is None:
+        endpoints = graph.outputs
+    endpoints = list(dict.fromkeys(np.asarray(endpoints).tolist()))
+    return _worst_paths(_path_columns(graph, early), _path_required(graph, early), k, endpoints, early)
+
+
+def _path_columns(graph, early=False):
+    """Plain-list copies of the columns the path search reads (list indexing is much faster than numpy scalars)."""
+    if early:
+        return graph.early_arrival.tolist(), graph.early_pin_delay.tolist(), graph.fanin_ptr.tolist(), graph.fanin_idx.tolist()
+    return graph.arrival.tolist(), graph.pin_delay.tolist(), graph.fanin_ptr.tolist(), graph.fanin_idx.tolist()
+
+
+def _path_required(graph, early=False):
+    """Required time of every node as a path endpoint (list), as in the required time passes."""
+    if early:
+        return [graph.hold_required] * graph.num_nodes
+    return _output_required(graph, graph.circuit_delay).tolist()
+
+
+def _worst_paths(columns, required, k, endpoints, early=False):
+    arrival, pin_delay, fanin_ptr, fanin_idx = columns
+    # slack = offset + sign * arrival : required - arrival (late), arrival - required (early)
+    sign = 1 if early else -1
+
+    # entries[i] = (node ID, suffix delay, parent entry, offset of the endpoint) ; parent is the next node 
+    # towards the endpoint.
+    entries = []
+    heap    = []
+    for endpoint in endpoints:
+        offset = -sign * required[endpoint]
+        entries.append((endpoint, 0.0, -1, offset))
+        heapq.heappush(heap, (offset + sign * arrival[endpoint], len(entries) - 1))
+
+    paths = []
+    while heap and len(paths) < k:
+        slack, entry = heapq.heappop(heap)
+        node_id, suffix_delay, _, offset = entries[entry]
+
+        lo, hi = fanin_ptr[node_id], fanin_ptr[node_id + 1]
+        if lo == hi:
+            path = []
+            while entry >= 0:
+                path.append(entries[entry][0])
+                entry = entries[entry][2]
+            paths.append((slack, arrival[node_id] + suffix_delay, path))
+            continue
+
+        for pin in range(lo, hi):
+            fan_in = fanin_idx[pin]
+            delay  = suffix_delay + pin_delay[pin]
+            entries.append((fan_in, delay, entry, offset))
+            heapq.heappush(heap, (offset + sign * (arrival[fan_in] + delay), len(entries) - 1))
+
+    return paths
+
+
+def worst_paths_per_endpoint(graph, k:int, early=False):
+    """
+    The `k` most critical paths ending at each primary output.
+
+    @return Dict of endpoint node ID -> list of (slack, path arrival, path) as in worst_paths().
+    """
+    columns  = _path_columns(graph, early)
+    required = _path_required(graph, early)
+    return {endpoint: _worst_paths(columns, required, k, [endpoint], early)
+            for endpoint in dict.fromkeys(graph.outputs.tolist())}
+
+
+def write_paths(graph, paths, file, title:str):
+    """Writes paths from worst_paths() in the same format as the rest of the report."""
+    file.write("\n")
+    file.write('-' * 70)
+    file.write("\n")
+    file.write(f"\t \t {title}")
+    file.write("\n")
+    file.write('-' * 70)
+    file.write("\n")
+    for i, (slack, arrival, path) in enumerate(paths, 1):
+        file.write(f"Path {i} : slack {slack * 1000} ps, arrival {arrival * 1000} ps\n")
+        for node_id in path:
+            file.write(f"{graph.type_names[graph.gate_type[node_id]]}-{graph.names[node_id]}\n")
+        file.write("\n")
+
+
+####################################################################################
+#     SECTION 10 : Arity aware cells
+#  Gates are timed with the library cell of their real width (NAND3_X1 for a 
+#  3 input NAND, ...). Gates wider than any cell in the library are split into
+#  trees of smaller cells once, when the graph is bound.
+####################################################################################
+
+# Function of the inner cells of a decomposed gate : NAND(a, b, c, d) = NAND(AND(a, b), AND(c, d))
+DECOMPOSE_INNER_FUNCTION = {
+    'NAND' : 'AND',
+    'AND'  : 'AND',
+    'NOR'  : 'OR',
+    'OR'   : 'OR',
+    'XOR'  : 'XOR',
+}
+
+_CELL_NAME = re.compile(r"([A-Z]+?)(\d*)_X(\d+)$")
+
+
+def library_cells(gate_type:str):
+    """
+    Cells of the loaded library that implement a .bench gate type, by number of inputs.
+
+    The library function is taken from the GATE_TYPE_TO_LUT_NAME cell 
+    (NAND2_X1 -> NAND), then every `<function><inputs>_X<drive>` cell is 
+    collected, keeping the weakest drive of each width (X1 when there is one).
+
+    @return Dict of input count -> cell name.
+    """
+    match = _CELL_NAME.match(GATE_TYPE_TO_LUT_NAME.get(gate_type, ""))
+    if match is None or not match.group(2):
+        return {}
+
+    widths = {}
+    for cell_name in LUT_nodes_set:
+        cell = _CELL_NAME.match(cell_name)
+        if cell is None or cell.group(1) != match.group(1) or not cell.group(2):
+            continue
+        width, drive = int(cell.group(2)), int(cell.group(3))
+        if width not in widths or drive < widths[width][0]:
+            widths[width] = (drive, cell_name)
+    return {width: cell_name for width, (_, cell_name) in widths.items()}
+
+
+def decompose_wide_gates(graph):
+    """
+    Makes the graph arity aware : every gate gets the library cell of its own
+    width, and gates of a width the library has no cell for are rebuilt as a 
+    tree of smaller cells.
+
+    Inputs are combined in groups of the widest inner cell (DECOMPOSE_INNER_FUNCTION),
+    oldest first, until they fit the widest root cell not wider than the gate, 
+    so trees are balanced. The original node becomes the root (it keeps its ID, 
+    name and fan-outs); the new inner nodes are appended after all netlist 
+    nodes and named `<gate>/<k>`. Called by bind_cells(graph, arity_aware=True);
+    the graph must not have been timed yet.
+
+    @throws ValueError if a gate cannot be built from the library cells.
+    """
+    if graph.arity_aware:
+        return
+
+    fanin_ptr = graph.fanin_ptr.tolist()
+    fanin_idx = graph.fanin_idx.tolist()
+    fanins    = [fanin_idx[fanin_ptr[node_id]:fanin_ptr[node_id + 1]] for node_id in range(graph.num_nodes)]
+    num_net_nodes = graph.num_nodes
+
+    new_names = []
+    new_types = []
+    type_code = {type_name: code for code, type_name in enumerate(graph.type_names)}
+
+    def type_of(type_name):
+        if type_name not in type_code:
+            type_code[type_name] = len(graph.type_names)
+            graph.type_names.append(type_name)
+        return type_code[type_name]
+
+    widths = {type_name: library_cells(type_name) for type_name in DECOMPOSE_INNER_FUNCTION}
+    arity  = np.diff(graph.fanin_ptr)
+    for code, type_name in enumerate(list(graph.type_names)):
+        if type_name not in DECOMPOSE_INNER_FUNCTION or not widths[type_name]:
+            continue
+        root_widths = sorted(width for width in widths[type_name] if width >= 2)
+        wide_gates  = [node_id for node_id in np.flatnonzero((graph.gate_type == code) & (arity > 2)).tolist()
+                       if arity[node_id] not in widths[type_name]]
+        if not wide_gates:
+            continue
+
+        inner_type   = DECOMPOSE_INNER_FUNCTION[type_name]
+        inner_widths = sorted(width for width in widths[inner_type] if width >= 2)
+        if not root_widths or not inner_widths:
+            raise ValueError(f"Cannot decompose '{type_name}' gates : no {type_name}/{inner_type} cells in the NLDM library")
+        inner_code = type_of(inner_type)
+
+        for node_id in wide_gates:
+            name       = graph.names[node_id]
+            root_width = max([width for width in root_widths if width <= arity[node_id]] or root_widths[:1])
+            pending    = deque(fanins[node_id])
+            while len(pending) > root_width:
+                # Widest inner cell that does not take the count below root_width
+                fits  = [width for width in inner_widths if width <= len(pending) - root_width + 1]
+                group = [pending.popleft() for _ in range(max(fits) if fits else inner_widths[0])]
+                inner_id = num_net_nodes + len(new_names)
+                new_names.append(f"{name}/{len(fanins) - num_net_nodes}")
+                new_types.append(inner_code)
+                fanins.append(group)
+                pending.append(inner_id)
+            fanins[node_id] = list(pending)
+
+    if new_names:
+        graph.names     = graph.names.extended(new_names)
+        graph.gate_type = np.concatenate((graph.gate_type, np.array(new_types, dtype=graph.gate_type.dtype)))
+        counts          = [len(pins) for pins in fanins]
+        graph.fanin_ptr = np.zeros(len(fanins) + 1, dtype=np.int32)
+        np.cumsum(counts, out=graph.fanin_ptr[1:])
+        graph.fanin_idx = np.array([fan_in for pins in fanins for fan_in in pins], dtype=np.int32)
+        _build_fanouts(graph)
+
+        added = len(new_names)
+        graph.is_output  = np.concatenate((graph.is_output, np.zeros(added, dtype=bool)))
+        graph.pi_arrival = np.concatenate((graph.pi_arrival, np.full(added, PI_ARRIVAL_TIME, dtype=np.float64)))
+        graph.pi_slew    = np.concatenate((graph.pi_slew, np.full(added, PI_SLEW, dtype=np.float64)))
+        if graph.po_load is not None:
+            graph.po_load = np.concatenate((graph.po_load, np.zeros(added)))
+        if graph.po_delay is not None:
+            graph.po_delay = np.concatenate((graph.po_delay, np.zeros(added)))
+        graph.topo_order = graph.level = graph.rank = None
+
+    graph.num_net_nodes = num_net_nodes
+    graph.arity_aware   = True
+    graph.cell          = None
+
+
+####################################################################################
+#     SECTION 11 : Shared memory graphs
+#  The arrays of a TimingGraph are moved into multiprocessing.shared_memory 
+#  blocks. Worker processes attach to them from a small, picklable descriptor
+#  instead of receiving a pickled copy of the design.
+####################################################################################
+
+# Structure, cells and timing columns placed in shared memory (fields that are None are skipped).
+_SHARED_ARRAYS = _NETLIST_ARRAYS + ("arc_sink", "is_output", "pi_arrival", "pi_slew", "cell", "cell_cap", "po_load",
+                                    "po_delay", "load_driver", "load_cell", "load_outputs",
+                                    "Cload", "arrival", "slew", "required", "slack", "pin_delay", "pin_slew", "worst_pin")
+
+
+def _attach_blocks(graph, blocks, layouts):
+    """Points the arrays and name table of `graph` at the shared memory `blocks` (field -> block)."""
+    shared = {field: np.ndarray(tuple(layout["shape"]), dtype=np.dtype(layout["dtype"]), buffer=blocks[field].buf)
+              for field, layout in layouts.items()}
+    for field, value in shared.items():
+        if field not in ("names_blob", "names_offsets"):
+            setattr(graph, field, value)
+    graph.names = NameTable.from_arrays(shared["names_blob"], shared["names_offsets"])
+    graph.shared_blocks = list(blocks.values())
+
+
+def share_timing_graph(graph):
+    """
+    Moves every array of `graph` (see _SHARED_ARRAYS, plus the name table) into
+    its own shared memory block and makes the graph use the shared copies.
+
+    Timing columns that are not computed yet are allocated (NaN), so workers 
+    can fill them. set_load_capacitance_csr() and the levelized passes 
+    (Compute_arrival_timing_levelized(), Compute_Required_Time_levelized()) 
+    write their results in place, into the shared blocks. The csr passes and 
+    ECO edits that change the structure replace the arrays with private ones.
+
+    The blocks stay alive until release_shared_graph(graph, unlink=True).
+
+    @return Descriptor (dict of block names, dtypes and shapes) to pass to attach_timing_graph().
+    """
+    if shared_memory is None:
+        raise ValueError("Shared memory graphs need Python 3.8 or newer (multiprocessing.shared_memory)")
+
+    _bound_cells(graph)
+    levelize(graph)
+    for field, size, fill, dtype in (("Cload",     graph.num_nodes,      np.nan, np.float64),
+                                     ("arrival",   graph.num_nodes,      np.nan, np.float64),
+                                     ("slew",      graph.num_nodes,      np.nan, np.float64),
+                                     ("required",  graph.num_nodes,      np.nan, np.float64),
+                                     ("slack",     graph.num_nodes,      np.nan, np.float64),
+                                     ("pin_delay", len(graph.fanin_idx), 0.0,    np.float64),
+                                     ("pin_slew",  len(graph.fanin_idx), 0.0,    np.float64),
+                                     ("worst_pin", graph.num_nodes,      -1,     np.int32)):
+        if getattr(graph, field) is None:
+            setattr(graph, field, np.full(size, fill, dtype=dtype))
+
+    arrays = {field: np.ascontiguousarray(getattr(graph, field)) 
+              for field in _SHARED_ARRAYS if getattr(graph, field) is not None}
+    arrays["names_blob"], arrays["names_offsets"] = graph.names.blob, graph.names.offsets
+
+    blocks  = {}
+    layouts = {}
+    for field, value in arrays.items():
+        blocks[field]  = shared_memory.SharedMemory(create=True, size=max(value.nbytes, 1))
+        layouts[field] = {"block": blocks[field].name, "dtype": value.dtype.str, "shape": list(value.shape)}
+        np.ndarray(value.shape, dtype=value.dtype, buffer=blocks[field].buf)[...] = value
+    _attach_blocks(graph, blocks, layouts)
+
+    return {
+        "type_names"    : list(graph.type_names),
+        "cells"         : [lut.cell_name for lut in graph.cells],
+        "arity_aware"   : graph.arity_aware,
+        "num_net_nodes" : graph.num_net_nodes,
+        "circuit_delay" : graph.circuit_delay,
+        "clock_period"  : graph.clock_period,
+        "lut_edge"      : graph.lut_edge,
+        "arrays"        : layouts,
+    }
+
+
+def attach_timing_graph(descriptor):
+    """
+    TimingGraph whose arrays are the shared memory blocks of `descriptor` (from
+    share_timing_graph()), typically in a worker process. Nothing is copied :
+    writes to the timing columns are seen by every process attached to them.
+
+    The cells are looked up by name in `LUT_nodes_set`, so the worker must 
+    have loaded the same library with get_nldm_data() first.
+
+    Call release_shared_graph(graph) when done (without unlinking the blocks).
+    """
+    if shared_memory is None:
+        raise ValueError("Shared memory graphs need Python 3.8 or newer (multiprocessing.shared_memory)")
+    missing = [cell_name for cell_name in descriptor["cells"] if cell_name not in LUT_nodes_set]
+    if missing:
+        raise ValueError(f"Cells {missing} of the shared graph are not in the loaded NLDM library")
+
+    graph  = TimingGraph()
+    blocks = {field: shared_memory.SharedMemory(name=layout["block"]) for field, layout in descriptor["arrays"].items()}
+    _attach_blocks(graph, blocks, descriptor["arrays"])
+
+    graph.type_names    = list(descriptor["type_names"])
+    graph.cells         = [LUT_nodes_set[cell_name] for cell_name in descriptor["cells"]]
+    graph.arity_aware   = descriptor["arity_aware"]
+    graph.num_net_nodes = descriptor["num_net_nodes"]
+    graph.circuit_delay = descriptor["circuit_delay"]
+    graph.clock_period  = descriptor["clock_period"]
+    graph.lut_edge      = descriptor["lut_edge"]
+    return graph
+
+
+def release_shared_graph(graph, unlink=False):
+    """
+    Detaches `graph` from its shared memory blocks. Its arrays are copied 
+    first, so the graph stays usable. Other references to the shared arrays
+    must be dropped before this is called.
+
+    @param[in] unlink Also free the blocks (the process that called 
+                      share_timing_graph() does this, once its workers are done).
+    """
+    for field, value in list(vars(graph).items()):
+        if isinstance(value, np.ndarray):
+            setattr(graph, field, np.array(value))
+    graph.names = NameTable.from_arrays(np.array(graph.names.blob), np.array(graph.names.offsets))
+
+    for block in graph.shared_blocks:
+        block.close()
+        if unlink:
+            block.unlink()
+    graph.shared_blocks = []
+
+
+####################################################################################
+#     SECTION 12 : Multi-corner analysis
+#  One graph timed against several libraries (PVT corners). Timing columns get
+#  one row per corner ([corners x nodes]) and all corners are propagated in the
+#  same levelized sweep : the pins, drivers and segments of a level are 
+#  gathered once and every corner reuses them.
+####################################################################################
+
+def get_corner_libraries(NLDM_FILES, use_cache=True):
+    """
+    Loads every .lib file (through the cache) without touching `LUT_nodes_set`.
+
+    @return List of (corner name, cell name -> LUT dict). The corner name is 
+            the file name without its extension.
+    @throws ValueError if two files give the same corner name.
+    """
+    libraries = []
+    for NLDM_FILE in NLDM_FILES:
+        name = os.path.splitext(os.path.basename(NLDM_FILE))[0]
+        if name in [corner for corner, _ in libraries]:
+            raise ValueError(f"Two libraries give the corner name '{name}'")
+        libraries.append((name, load_nldm_luts(NLDM_FILE, use_cache)))
+    print(f"NLDM data extracted successfully for {len(libraries)} corners.")
+    return libraries
+
+
+def bind_corners(graph, libraries):
+    """
+    Binds the graph to every corner. Cells are picked once, by bind_cells() 
+    (from `LUT_nodes_set`); each corner then uses its own cell of the same name.
+
+    @param[in] libraries List of (corner name, cell name -> LUT dict), see get_corner_libraries().
+    @throws ValueError if a corner library lacks a cell used by the graph.
+    """
+    cells = _bound_cells(graph)
+    graph.corners      = []
+    graph.corner_luts  = []
+    graph.corner_cells = []
+    for name, luts in libraries:
+        missing = [lut.cell_name for lut in cells if lut.cell_name not in luts]
+        if missing:
+            raise ValueError(f"Cells {missing} are not in the library of corner '{name}'")
+        graph.corners.append(name)
+        graph.corner_luts.append(luts)
+        graph.corner_cells.append([luts[lut.cell_name] for lut in cells])
+
+
+def set_load_capacitance_corners(graph, po_load=None):
+    """
+    set_load_capacitance_csr() for every corner, into `corner_Cload`.
+
+    @param[in] po_load Load on primary outputs (number or one entry per node, 
+                       e.g. the `po_load` of read_sdc()), the same in every 
+                       corner. Outputs without a load (None or NaN) get 
+                       PO_LOAD_INV_X1 inputs of the INV_X1 of their corner.
+    """
+    drivers, pin_cells, load_outputs = _load_pins(graph)
+    po_load = np.full(graph.num_nodes, np.nan) if po_load is None else po_load
+    po_load = np.broadcast_to(np.asarray(po_load, dtype=np.float64), (graph.num_nodes,))[load_outputs]
+    graph.corner_Cload = np.empty((len(graph.corners), graph.num_nodes))
+    for corner, (cells, luts) in enumerate(zip(graph.corner_cells, graph.corner_luts)):
+        caps = np.append(np.array([lut.capacitance for lut in cells], dtype=np.float64), 0.0)[pin_cells]
+        graph.corner_Cload[corner] = np.bincount(drivers, weights=caps, minlength=graph.num_nodes)
+        default = PO_LOAD_INV_X1 * float(luts['INV_X1'].capacitance)
+        graph.corner_Cload[corner, load_outputs] = np.where(np.isnan(po_load), default, po_load)
+
+
+def Compute_arrival_timing_corners(graph, edge="legacy"):
+    """
+    Compute_arrival_timing_levelized() for all corners in one sweep.
+
+    For every level the input pins, their drivers, the gate segments and the
+    pins of every cell are found once; only the table lookups are done per 
+    corner. Row `c` of the results is bit-identical to a single corner run 
+    with library `c`.
+
+    @param[in] edge Table edge handling, see LUT.interpolate_batch().
+    """
+    num_corners = len(graph.corners)
+    num_pins    = len(graph.fanin_idx)
+
+    arrival   = np.full((num_corners, graph.num_nodes), np.nan)
+    slew      = np.full((num_corners, graph.num_nodes), np.nan)
+    pin_delay = np.zeros((num_corners, num_pins))
+    pin_slew  = np.zeros((num_corners, num_pins))
+    worst_pin = np.full((num_corners, graph.num_nodes), -1, dtype=np.int32)
+
+    levels = levelize(graph)
+    if levels:
+        arrival[:, levels[0]] = graph.pi_arrival[levels[0]]
+        slew[:, levels[0]]    = graph.pi_slew[levels[0]]
+
+    for gates in levels[1:]:
+        pins, counts = _csr_positions(graph.fanin_ptr, gates)
+        drivers  = graph.fanin_idx[pins]
+        in_slew  = slew[:, drivers]
+        pin_load = np.repeat(graph.corner_Cload[:, gates], counts, axis=1)
+        pin_cell = np.repeat(graph.cell[gates], counts)
+
+        delay    = np.empty((num_corners, len(pins)))
+        out_slew = np.empty((num_corners, len(pins)))
+        for cell in np.unique(pin_cell).tolist():
+            mask = pin_cell == cell
+            for corner, cells in enumerate(graph.corner_cells):
+                delay[corner, mask], out_slew[corner, mask] = cells[cell].interpolate_delay_slew_batch(
+                    in_slew[corner, mask], pin_load[corner, mask], edge)
+
+        starts    = np.cumsum(counts) - counts
+        pin_a_out = arrival[:, drivers] + delay
+        arrival[:, gates]   = _segment_max(pin_a_out, starts)
+        slew[:, gates]      = _segment_max(out_slew, starts)
+        pin_delay[:, pins]  = delay
+        pin_slew[:, pins]   = out_slew
+        worst_pin[:, gates] = _segment_argmax(pin_a_out, starts, arrival[:, gates])
+
+    graph.corner_arrival   = arrival
+    graph.corner_slew      = slew
+    graph.corner_pin_delay = pin_delay
+    graph.corner_pin_slew  = pin_slew
+    graph.corner_worst_pin = worst_pin
+    graph.lut_edge         = edge
+
+
+def Compute_Required_Time_corners(graph):
+    """
+    Compute_Required_Time_levelized() for all corners in one sweep. All 
+    corners share one circuit delay : the clock period, else 1.1 * the latest
+    output arrival over all corners, so their slacks compare directly.
+
+    @return Circuit delay (shared by all corners).
+    """
+    circuit_delay   = _circuit_delay(graph, graph.corner_arrival[:, graph.outputs].ravel().tolist())
+    output_required = _output_required(graph, circuit_delay)
+
+    required = np.tile(output_required, (len(graph.corners), 1))
+    for nodes_in_level in reversed(levelize(graph)):
+        positions, counts = _csr_positions(graph.fanout_ptr, nodes_in_level)
+        drivers = nodes_in_level[counts > 0]
+        if not drivers.size:
+            continue
+        arcs   = graph.fanout_pin[positions]
+        starts = (np.cumsum(counts) - counts)[counts > 0]
+        _required = np.fmin.reduceat(required[:, graph.arc_sink[arcs]] - graph.corner_pin_delay[:, arcs], starts, axis=1)
+        required[:, drivers] = np.fmin(_required, np.where(graph.is_output[drivers], output_required[drivers], np.inf))
+
+    graph.corner_required = required
+    graph.corner_slack    = required - graph.corner_arrival
+    graph.circuit_delay   = circuit_delay
+
+    return circuit_delay
+
+
+def corner_worst_slack(graph):
+    """Worst (smallest, NaN skipped) slack of every corner."""
+    return np.fmin.reduce(graph.corner_slack, axis=1)
+
+
+def worst_corner(graph):
+    """Index of the corner with the smallest worst slack (against the shared circuit delay)."""
+    worst_slack = corner_worst_slack(graph)
+    return int(np.argmin(np.where(np.isnan(worst_slack), np.inf, worst_slack)))
+
+
+def corner_graph(graph, corner:int):
+    """
+    Single corner view of a multi-corner graph : a shallow copy whose timing 
+    columns are row `corner` of the corner matrices (views, not copies). 
+    Reports and path searches (nodes_view(), worst_paths(), ...) run on it 
+    unchanged. Not meant for ECO edits.
+    """
+    view = copy.copy(graph)
+    view.cells         = graph.corner_cells[corner]
+    view.cell_cap      = np.array([lut.capacitance for lut in view.cells], dtype=np.float64)
+    view.Cload         = graph.corner_Cload[corner]
+    view.arrival       = graph.corner_arrival[corner]
+    view.slew          = graph.corner_slew[corner]
+    view.pin_delay     = graph.corner_pin_delay[corner]
+    view.pin_slew      = graph.corner_pin_slew[corner]
+    view.worst_pin     = graph.corner_worst_pin[corner]
+    view.required      = graph.corner_required[corner]
+    view.slack         = graph.corner_slack[corner]
+    return view
+
+
+def write_corner_summary(graph, file):
+    """Writes the shared circuit delay, the worst slack of every corner and the overall worst slack."""
+    worst_slack = corner_worst_slack(graph)
+    worst       = worst_corner(graph)
+
+    file.write("\n\n")
+    file.write('-' * 70)
+    file.write("\n\t \t CORNERS\n")
+    file.write('-' * 70)
+    file.write(f"\nCircuit delay (all corners) : {graph.circuit_delay * 1000} ps")
+    for corner, name in enumerate(graph.corners):
+        file.write(f"\n{name} : worst slack {worst_slack[corner] * 1000} ps")
+    file.write(f"\nOVERALL : worst slack {worst_slack[worst] * 1000} ps ({graph.corners[worst]})")
+
+
+####################################################################################
+#     SECTION 13 : Rise / fall timing
+#  Separate arrival and slew for rising and falling outputs. The timing sense 
+#  of a cell decides which input transition drives which output transition :
+#      positive_unate : rise -> rise, fall -> fall  (AND, OR, BUF)
+#      negative_unate : rise -> fall, fall -> rise  (NAND, NOR, INV)
+#      non_unate      : both input transitions drive both outputs (XOR)
+#  Every (cell, input transition, output transition) arc is one batched lookup
+#  over all pins of that cell in a level, so a unate design costs two lookups
+#  per pin instead of one.
+####################################################################################
+
+def _sense_arcs(timing_sense:str, transition:int):
+    """Input transitions that drive `transition` at the output of a cell with `timing_sense`."""
+    if timing_sense == "positive_unate":
+        return (transition,)
+    if timing_sense == "negative_unate":
+        return (1 - transition,)
+    return (RISE, FALL)
+
+
+def Compute_arrival_timing_rise_fall(graph, edge="legacy"):
+    """
+    Compute_arrival_timing_levelized() with separate rise and fall arrival / 
+    slew (`rf_arrival`, `rf_slew`, rows RISE and FALL).
+
+    For every level, the arc delay and output slew of every pin are looked up
+    for each (input transition, output transition) pair the cell's timing 
+    sense allows, with the input slew of that input transition and the 
+    cell_rise/rise_transition or cell_fall/fall_transition tables of the 
+    output transition. The arrival of an output transition is the latest over
+    all pins and allowed input transitions. Arcs a cell does not have are NaN
+    in `rf_pin_delay`.
+
+    With a library without separate rise/fall tables, both rows equal the 
+    arrival and slew of Compute_arrival_timing_levelized().
+
+    @param[in] edge Table edge handling, see LUT.interpolate_batch().
+    """
+    node_luts = _bound_cells(graph)
+    num_pins  = len(graph.fanin_idx)
+
+    arrival   = np.full((2, graph.num_nodes), np.nan)
+    slew      = np.full((2, graph.num_nodes), np.nan)
+    pin_delay = np.full((2, 2, num_pins), np.nan)
+
+    levels = levelize(graph)
+    if levels:
+        arrival[:, levels[0]] = graph.pi_arrival[levels[0]]
+        slew[:, levels[0]]    = graph.pi_slew[levels[0]]
+
+    for gates in levels[1:]:
+        pins, counts = _csr_positions(graph.fanin_ptr, gates)
+        drivers  = graph.fanin_idx[pins]
+        pin_load = np.repeat(graph.Cload[gates], counts)
+        pin_cell = np.repeat(graph.cell[gates], counts)
+
+        delay    = np.full((2, 2, len(pins)), np.nan)
+        out_slew = np.full((2, 2, len(pins)), np.nan)
+        for cell in np.unique(pin_cell).tolist():
+            lut  = node_luts[cell]
+            mask = pin_cell == cell
+            for transition in (RISE, FALL):
+                for in_transition in _sense_arcs(lut.timing_sense, transition):
+                    delay[in_transition, transition, mask], out_slew[in_transition, transition, mask] = \
+                        lut.interpolate_delay_slew_batch(slew[in_transition, drivers[mask]], pin_load[mask], edge, transition)
+
+        # Latest over the input transitions (missing arcs are NaN and skipped), then over the pins of each gate.
+        starts    = np.cumsum(counts) - counts
+        pin_a_out = np.fmax(arrival[RISE, drivers] + delay[RISE], arrival[FALL, drivers] + delay[FALL])
+        arrival[:, gates]    = _segment_max(pin_a_out, starts)
+        slew[:, gates]       = _segment_max(np.fmax(out_slew[RISE], out_slew[FALL]), starts)
+        pin_delay[:, :, pins] = delay
+
+    graph.rf_arrival   = arrival
+    graph.rf_slew      = slew
+    graph.rf_pin_delay = pin_delay
+    graph.lut_edge     = edge
+
+
+def Compute_Required_Time_rise_fall(graph):
+    """
+    Compute_Required_Time_levelized() for rise and fall (`rf_required`, 
+    `rf_slack`). Without a clock the circuit delay is 1.1 times the latest 
+    output arrival of either transition. The required time of a driver 
+    transition is the earliest over its fan-out arcs and the output 
+    transitions they drive.
+
+    @return Circuit delay.
+    """
+    circuit_delay   = _circuit_delay(graph, graph.rf_arrival[:, graph.outputs].ravel().tolist())
+    output_required = _output_required(graph, circuit_delay)
+
+    required = np.tile(output_required, (2, 1))
+    for nodes_in_level in reversed(levelize(graph)):
+        positions, counts = _csr_positions(graph.fanout_ptr, nodes_in_level)
+        drivers = nodes_in_level[counts > 0]
+        if not drivers.size:
+            continue
+        arcs   = graph.fanout_pin[positions]
+        starts = (np.cumsum(counts) - counts)[counts > 0]
+        sink_required = required[:, graph.arc_sink[arcs]]
+        for in_transition in (RISE, FALL):
+            # fmin skips the NaN delays of arcs the cell does not have.
+            arc_required = np.fmin(sink_required[RISE] - graph.rf_pin_delay[in_transition, RISE, arcs],
+                                   sink_required[FALL] - graph.rf_pin_delay[in_transition, FALL, arcs])
+            _required = np.fmin.reduceat(arc_required, starts)
+            required[in_transition, drivers] = np.fmin(_required, np.where(graph.is_output[drivers], output_required[drivers], np.inf))
+
+    graph.rf_required   = required
+    graph.rf_slack      = required - graph.rf_arrival
+    graph.circuit_delay = circuit_delay
+
+    return circuit_delay
+
+
+def rise_fall_graph(graph):
+    """
+    Worst-of-both view of a graph timed with Compute_arrival_timing_rise_fall()
+    and Compute_Required_Time_rise_fall() : a shallow copy where `arrival` and
+    `slew` are the latest of rise and fall, `required` and `slack` the 
+    earliest. For the slack report and Find_critical_path(); pin level 
+    columns (worst paths) are not filled.
+    """
+    view = copy.copy(graph)
+    view.arrival   = np.fmax(graph.rf_arrival[RISE], graph.rf_arrival[FALL])
+    view.slew      = np.fmax(graph.rf_slew[RISE], graph.rf_slew[FALL])
+    view.required  = np.fmin(graph.rf_required[RISE], graph.rf_required[FALL])
+    view.slack     = np.fmin(graph.rf_slack[RISE], graph.rf_slack[FALL])
+    view.pin_delay = view.pin_slew = view.worst_pin = None
+    return view
+
+
+####################################################################################
+#     SECTION 14 : Early / late (min / max) timing
+#  Late (max, setup) and early (min, hold) arrivals propagated in the same 
+#  levelized sweep. Both input slews of a pin go through the same batched 
+#  table lookup. Early required times start from `hold_required` at the 
+#  outputs and are propagated backwards with a max; early slack is 
+#  early arrival - early required (negative : a hold violation).
+####################################################################################
+
+def Compute_arrival_timing_min_max(graph, edge="legacy"):
+    """
+    Compute_arrival_timing_levelized() and its early (min) counterpart in one
+    sweep. Late results go to the usual columns and are bit-identical to 
+    Compute_arrival_timing_levelized(); early results go to `early_arrival`,
+    `early_slew`, `early_pin_delay` and `early_worst_pin` (the earliest 
+    arrival and smallest slew over the pins of each gate).
+
+    For every level and cell, the late and early input slews of all its pins
+    are looked up in one interpolate_delay_slew_batch() call.
+
+    @param[in] edge Table edge handling, see LUT.interpolate_batch().
+    """
+    node_luts = _bound_cells(graph)
+    num_pins  = len(graph.fanin_idx)
+
+    arrival   = _timing_column(graph, "arrival",   graph.num_nodes, np.nan)
+    slew      = _timing_column(graph, "slew",      graph.num_nodes, np.nan)
+    pin_delay = _timing_column(graph, "pin_delay", num_pins, 0.0)
+    pin_slew  = _timing_column(graph, "pin_slew",  num_pins, 0.0)
+    worst_pin = _timing_column(graph, "worst_pin", graph.num_nodes, -1, np.int32)
+    graph.lut_edge = edge
+
+    early_arrival   = np.full(graph.num_nodes, np.nan)
+    early_slew      = np.full(graph.num_nodes, np.nan)
+    early_pin_delay = np.zeros(num_pins)
+    early_worst_pin = np.full(graph.num_nodes, -1, dtype=np.int32)
+
+    levels = levelize(graph)
+    if levels:
+        arrival[levels[0]] = early_arrival[levels[0]] = graph.pi_arrival[levels[0]]
+        slew[levels[0]]    = early_slew[levels[0]]    = graph.pi_slew[levels[0]]
+
+    for gates in levels[1:]:
+        pins, counts = _csr_positions(graph.fanin_ptr, gates)
+        drivers  = graph.fanin_idx[pins]
+        # Every pin twice : [late input slews | early input slews]
+        in_slew  = np.concatenate((slew[drivers], early_slew[drivers]))
+        pin_load = np.tile(np.repeat(graph.Cload[gates], counts), 2)
+        pin_cell = np.tile(np.repeat(graph.cell[gates], counts), 2)
+
+        delay    = np.empty(len(in_slew))
+        out_slew = np.empty(len(in_slew))
+        for cell in np.unique(pin_cell).tolist():
+            lut  = node_luts[cell]
+            mask = pin_cell == cell
+            delay[mask], out_slew[mask] = lut.interpolate_delay_slew_batch(in_slew[mask], pin_load[mask], edge)
+        (delay, early_delay), (out_slew, early_out_slew) = delay.reshape(2, -1), out_slew.reshape(2, -1)
+
+        starts    = np.cumsum(counts) - counts
+        pin_a_out = arrival[drivers] + delay
+        arrival[gates]   = _segment_max(pin_a_out, starts)
+        slew[gates]      = _segment_max(out_slew, starts)
+        pin_delay[pins]  = delay
+        pin_slew[pins]   = out_slew
+        worst_pin[gates] = _segment_argmax(pin_a_out, starts, arrival[gates])
+
+        pin_early = early_arrival[drivers] + early_delay
+        early_arrival[gates]   = _segment_min(pin_early, starts)
+        early_slew[gates]      = _segment_min(early_out_slew, starts)
+        early_pin_delay[pins]  = early_delay
+        early_worst_pin[gates] = _segment_argmax(pin_early, starts, early_arrival[gates])
+
+    graph.early_arrival   = early_arrival
+    graph.early_slew      = early_slew
+    graph.early_pin_delay = early_pin_delay
+    graph.early_worst_pin = early_worst_pin
+
+
+def Compute_Required_Time_min_max(graph, hold_required=HOLD_REQUIRED_TIME):
+    """
+    Late required times (Compute_Required_Time_levelized()) and early ones.
+
+    The early required time of a node is the latest over its fan-out arcs of
+    `early_required[sink] - early_pin_delay`, and at least `hold_required` 
+    on primary outputs. Nodes without fan-outs get `hold_required`.
+
+    @param[in] hold_required Earliest allowed arrival at primary outputs.
+    @return Circuit delay (late).
+    """
+    circuit_delay = Compute_Required_Time_levelized(graph)
+
+    required = np.full(graph.num_nodes, float(hold_required))
+    for nodes_in_level in reversed(levelize(graph)):
+        positions, counts = _csr_positions(graph.fanout_ptr, nodes_in_level)
+        drivers = nodes_in_level[counts > 0]
+        if not drivers.size:
+            continue
+        arcs   = graph.fanout_pin[positions]
+        starts = (np.cumsum(counts) - counts)[counts > 0]
+        _required = np.fmax.reduceat(required[graph.arc_sink[arcs]] - graph.early_pin_delay[arcs], starts)
+        required[drivers] = np.fmax(_required, np.where(graph.is_output[drivers], float(hold_required), -np.inf))
+
+    graph.early_required = required
+    graph.early_slack    = graph.early_arrival - required
+    graph.hold_required  = float(hold_required)
+
+    return circuit_delay
+
+
+def early_graph(graph):
+    """
+    Early (hold) view of a graph timed with Compute_arrival_timing_min_max()
+    and Compute_Required_Time_min_max() : a shallow copy whose arrival, slew,
+    pin delay, worst pin, required time and slack columns are the early ones,
+    for the slack report, Find_critical_path() and Find_endpoint_paths().
+    Use worst_paths(graph, k, early=True) on the graph itself for paths.
+    """
+    view = copy.copy(graph)
+    view.arrival   = graph.early_arrival
+    view.slew      = graph.early_slew
+    view.pin_delay = graph.early_pin_delay
+    view.pin_slew  = None
+    view.worst_pin = graph.early_worst_pin
+    view.required  = graph.early_required
+    view.slack     = graph.early_slack
+    return view
+
+
+####################################################################################
+#     SECTION 15 : Constraints (SDC subset)
+#  Per-port arrival times, slews, loads and output delays, and the clock period,
+#  read from a constraints file into the per-node columns of a TimingGraph.
+####################################################################################
+
+# Port command -> (graph column, port direction it applies to)
+SDC_PORT_COMMANDS = {
+    "set_input_delay"      : ("pi_arrival", "input"),
+    "set_input_transition" : ("pi_slew",    "input"),
+    "set_load"             : ("po_load",    "output"),
+    "set_output_delay"     : ("po_delay",   "output"),
+}
+SDC_OPTION_ARGS = ("-clock", "-name", "-period", "-waveform", "-reference_pin")  # Options followed by a value
+
+
+def _sdc_float(token:str, line:int):
+    try:
+        return float(token)
+    except ValueError:
+        raise ValueError(f"SDC line {line} : expected a number, got '{token}'")
+
+
+def _sdc_ports(token:str):
+    """Port patterns of `[get_ports {A B*}]`, `[get_ports A]`, `{A B}` or `A`; `[all_inputs]` / `[all_outputs]` are kept as is."""
+    if token.startswith("["):
+        words = token[1:-1].replace("{", " ").replace("}", " ").split()
+        if words and words[0] in ("all_inputs", "all_outputs"):
+            return [f"[{words[0]}]"]
+        if not words or words[0] != "get_ports":
+            raise ValueError(f"Unsupported port list {token}")
+        return [word for word in words[1:] if not word.startswith("-")]
+    return token.strip('{}"').split()
+
+
+def _sdc_statements(text:str):
+    """(line number, statement) of every command, with `\\` continuations joined and comments removed."""
+    statement, first_line = "", None
+    for line, text_line in enumerate(text.split("\n"), start=1):
+        text_line  = text_line.split("#", 1)[0].rstrip()
+        first_line = line if first_line is None else first_line
+        if text_line.endswith("\\"):
+            statement += text_line[:-1] + " "
+            continue
+        yield first_line, statement + text_line
+        statement, first_line = "", None
+
+
+def parse_sdc(text:str):
+    """
+    Parses the SDC subset used to constrain the ports of a combinational netlist :
+
+        create_clock -period P [-name N] [-waveform {..}] [ports]
+        set_input_delay      V [-clock C] [-max] ports   (arrival time at inputs)
+        set_input_transition V [-max] ports              (slew at inputs)
+        set_load             V [-pin_load] [-max] ports  (load on outputs)
+        set_output_delay     V [-clock C] [-max] ports   (external delay after outputs)
+
+    Ports are `[get_ports {A B*}]`, `[all_inputs]`, `[all_outputs]`, `{A B}` or
+    plain names; `*` and `?` are wildcards. Values are in the time and 
+    capacitance units of the .lib file. Commands with `-min` (hold values) and
+    other SDC commands are skipped.
+
+    @return (commands, skipped) : list of (line number, command, value, port 
+            patterns) and list of (line number, command) that were skipped.
+    """
+    commands, skipped = [], []
+    for line, statement in _sdc_statements(text):
+        tokens = re.findall(r'\[[^\]]*\]|\{[^}]*\}|"[^"]*"|[^\s;]+', statement)
+        if not tokens:
+            continue
+        command, tokens = tokens[0], tokens[1:]
+        if command != "create_clock" and command not in SDC_PORT_COMMANDS:
+            skipped.append((line, command))
+            continue
+
+        options, positional = {}, []
+        k = 0
+        while k < len(tokens):
+            token = tokens[k]
+            if token.startswith("-") and not re.match(r"-[\d.]", token):
+                if token in SDC_OPTION_ARGS:
+                    if k + 1 == len(tokens):
+                        raise ValueError(f"SDC line {line} : {token} needs a value")
+                    options[token] = tokens[k + 1]
+                    k += 1
+                else:
+                    options[token] = True
+            else:
+                positional.append(token)
+            k += 1
+
+        if "-min" in options and "-max" not in options:
+            skipped.append((line, command))
+            continue
+
+        if command == "create_clock":
+            if "-period" not in options:
+                raise ValueError(f"SDC line {line} : create_clock needs -period")
+            commands.append((line, command, _sdc_float(options["-period"], line), []))
+        else:
+            if len(positional) < 2:
+                raise ValueError(f"SDC line {line} : {command} needs a value and a port list")
+            ports = []
+            for token in positional[1:]:
+                try:
+                    ports.extend(_sdc_ports(token))
+                except ValueError as e:
+                    raise ValueError(f"SDC line {line} : {e}")
+            commands.append((line, command, _sdc_float(positional[0], line), ports))
+
+    return commands, skipped
+
+
+def apply_constraints(graph, commands):
+    """
+    Writes parsed constraints (see parse_sdc()) into `pi_arrival`, `pi_slew`,
+    `po_load`, `po_delay` and `clock_period` of the graph. Later commands 
+    override earlier ones on the same port, ports without a constraint keep
+    their value. Outputs without set_load keep a NaN `po_load`, so the default
+    load (4 INV_X1 inputs) is taken from the library that times them : each
+    corner uses its own INV_X1. Port names are resolved with
+    NameTable.match(), so a wildcard over thousands of ports costs one binary
+    search plus the matching IDs.
+
+    Call before the timing passes; with arity aware cells, after bind_cells().
+    Outputs then require `clock period - output delay` (or 
+    `1.1 * latest arrival - output delay` without a clock).
+    """
+    is_port = {
+        "input"  : graph.fanin_ptr[1:] == graph.fanin_ptr[:-1],
+        "output" : graph.is_output,
+    }
+
+    if graph.po_load is None or len(graph.po_load) != graph.num_nodes:
+        graph.po_load = np.full(graph.num_nodes, np.nan)
+    if graph.po_delay is None:
+        graph.po_delay = np.zeros(graph.num_nodes)
+
+    for command, value, node_ids in _constraint_ports(graph.names, is_port, commands):
+        if command == "create_clock":
+            graph.clock_period = value
+        else:
+            getattr(graph, SDC_PORT_COMMANDS[command][0])[node_ids] = value
+
+
+def apply_node_constraints(nodes_set, commands):
+    """
+    apply_constraints() for the node engine : writes the constraints into the
+    `pi_arrival`, `pi_slew`, `po_load` and `po_delay` attributes of the nodes
+    and into the global `clock_period`. Call after get_bench_nodes(), before 
+    set_load_capacitance().
+    """
+    global clock_period
+
+    node_list    = list(nodes_set.values())
+    output_names = {output_node.name for output_node in outputs_list}
+    is_port = {
+        "input"  : np.array([node.gate_type == "INPUT" for node in node_list], dtype=bool),
+        "output" : np.array([node.name in output_names for node in node_list], dtype=bool),
+    }
+
+    for command, value, node_ids in _constraint_ports(NameTable(list(nodes_set)), is_port, commands):
+        if command == "create_clock":
+            clock_period = value
+        else:
+            field = SDC_PORT_COMMANDS[command][0]
+            for node_id in node_ids.tolist():
+                setattr(node_list[node_id], field, value)
+
+
+def _constraint_ports(names, is_port, commands):
+    """
+    Resolves the ports of parsed constraints, in file order.
+
+    @param[in] names   NameTable of the nodes.
+    @param[in] is_port Dict "input" / "output" -> bool mask of the port nodes.
+    @return Generator of (command, value, node IDs); node IDs are None for create_clock.
+    @throws ValueError on two different clock periods.
+    """
+    clock_line = None
+    for line, command, value, patterns in commands:
+        if command == "create_clock":
+            if clock_line is not None and value != clock_value:
+                raise ValueError(f"SDC line {line} : only one clock period is supported (see line {clock_line})")
+            clock_value, clock_line = value, line
+            yield command, value, None
+            continue
+
+        direction = SDC_PORT_COMMANDS[command][1]
+        for pattern in patterns:
+            if pattern in ("[all_inputs]", "[all_outputs]"):
+                node_ids = np.flatnonzero(is_port["input" if pattern == "[all_inputs]" else "output"])
+            else:
+                node_ids = names.match(pattern)
+            node_ids = node_ids[is_port[direction][node_ids]]
+            if not node_ids.size:
+                print(f"SDC line {line} : '{pattern}' matches no {direction} port")
+            yield command, value, node_ids
+
+
+def read_sdc(SDC_FILE:str, graph=None):
+    """
+    Reads a constraints file (parse_sdc()) and applies it to the graph 
+    (apply_constraints()), or to `nodes` of the node engine if `graph` is None
+    (apply_node_constraints()).
+
+    @return Number of constraint commands applied.
+    """
+    with open(SDC_FILE, "r") as file:
+        commands, skipped = parse_sdc(file.read())
+    if skipped:
+        print(f"Skipped SDC commands : {', '.join(f'{command} (line {line})' for line, command in skipped)}")
+    if graph is None:
+        apply_node_constraints(nodes, commands)
+    else:
+        apply_constraints(graph, commands)
+    print("Constraints applied successfully.")
+    return len(commands)
+
+
+####################################################################################
+#     SECTION 16 : Endpoint cones
+#  Timing of a few primary outputs only : their transitive fan-in cone is cut
+#  out of the graph and timed on its own with any of the engines above.
+####################################################################################
+
+def select_outputs(graph, patterns):
+    """
+    Node IDs (ascending) of the primary outputs whose names match any of the 
+    glob `patterns` (see NameTable.match()).
+    """
+    matched = [graph.names.match(pattern) for pattern in patterns]
+    node_ids = np.unique(np.concatenate(matched)) if matched else np.zeros(0, dtype=np.int64)
+    node_ids = node_ids[graph.is_output[node_ids]]
+    if not node_ids.size:
+        raise ValueError(f"No primary output matches {' '.join(patterns)}")
+    return node_ids
+
+
+def fanin_cone(graph, node_ids):
+    """
+    Boolean mask of the transitive fan-in cone of `node_ids` (them included).
+    Breadth first : every step gathers the fan-ins of the whole frontier from
+    the fan-in CSR arrays, and the mask keeps nodes from being visited twice.
+    """
+    in_cone  = np.zeros(graph.num_nodes, dtype=bool)
+    frontier = np.unique(np.asarray(node_ids, dtype=np.int64))
+    in_cone[frontier] = True
+    while frontier.size:
+        positions, _ = _csr_positions(graph.fanin_ptr, frontier)
+        fan_ins  = np.unique(graph.fanin_idx[positions])
+        frontier = fan_ins[~in_cone[fan_ins]]
+        in_cone[frontier] = True
+    return in_cone
+
+
+def cone_graph(graph, endpoints):
+    """
+    TimingGraph of the fan-in cone of `endpoints` (node IDs of primary outputs),
+    which are its only primary outputs. Nodes keep their order, names, cells 
+    and port constraints; `cone_nodes` gives their ID in `graph`.
+
+    A node of the cone may also drive gates outside of it. Every fan-out pin 
+    of the full graph is kept as a load pin (`load_driver`, `load_cell`, see
+    _load_pins()), so the loads, and so the arrival times, are exactly those 
+    of the full graph. Required times and slacks only see the endpoints : 
+    the circuit delay is taken over them, and other outputs inside the cone 
+    are timed as internal nodes.
+
+    The cone is a snapshot : eco_* edits are not supported on it.
+    """
+    _bound_cells(graph)
+    endpoints = np.unique(np.asarray(endpoints, dtype=np.int64))
+    nodes     = np.flatnonzero(fanin_cone(graph, endpoints))
+    cone_id   = np.full(graph.num_nodes, -1, dtype=np.int32)
+    cone_id[nodes] = np.arange(len(nodes), dtype=np.int32)
+
+    cone = TimingGraph()
+    cone.names      = NameTable([graph.names[node_id] for node_id in nodes.tolist()])
+    cone.type_names = list(graph.type_names)
+    cone.gate_type  = graph.gate_type[nodes]
+    positions, counts = _csr_positions(graph.fanin_ptr, nodes)
+    cone.fanin_ptr  = np.zeros(len(nodes) + 1, dtype=np.int32)
+    np.cumsum(counts, out=cone.fanin_ptr[1:])
+    cone.fanin_idx  = cone_id[graph.fanin_idx[positions]]
+    _build_fanouts(cone)
+
+    cone.outputs = cone_id[endpoints]
+    _init_graph_columns(cone)
+    for field in ("pi_arrival", "pi_slew", "po_load", "po_delay"):
+        if getattr(graph, field) is not None:
+            setattr(cone, field, getattr(graph, field)[nodes])
+    cone.clock_period = graph.clock_period
+
+    cone.cells       = list(graph.cells)
+    cone.cell        = graph.cell[nodes]
+    cone.cell_cap    = graph.cell_cap.copy()
+    cone.arity_aware = graph.arity_aware
+    if graph.num_net_nodes is not None:
+        cone.num_net_nodes = int(np.count_nonzero(nodes < graph.num_net_nodes))
+
+    drivers, pin_cells, load_outputs = _load_pins(graph)
+    keep = cone_id[drivers] >= 0
+    cone.load_driver  = cone_id[drivers[keep]]
+    cone.load_cell    = pin_cells[keep]
+    cone.load_outputs = cone_id[load_outputs][cone_id[load_outputs] >= 0]
+    cone.cone_nodes   = nodes
+    return cone
+
+
+####################################################################################
+#     SECTION 17 : Interpolation cache
+#  Optional memo of the scalar table lookups of the node and csr engines (the
+#  levelized engines interpolate whole levels at once and do not use it).
+####################################################################################
+
+def enable_interpolation_cache(maxsize=INTERPOLATION_CACHE_SIZE, slew_quantum=None, load_quantum=None):
+    """
+    Puts a new InterpolationCache in front of every LUT.interpolate_delay_slew()
+    call. Exact keys (no quantum) give results identical to uncached lookups.
+
+    @return The cache (read `hits`, `misses` or stats() after the run).
+    """
+    global interpolation_cache
+    interpolation_cache = InterpolationCache(maxsize, slew_quantum, load_quantum)
+    return interpolation_cache
 
 
+def disable_interpolation_cache():
+    """Removes the interpolation cache. @return The removed cache, or None."""
+    global interpolation_cache
+    cache, interpolation_cache = interpolation_cache, None
+    return cache